@@ -3,14 +3,19 @@
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, Aer, execute
 from qiskit.circuit import Parameter
+from qiskit.quantum_info import Statevector
 from qiskit.aqua.components.optimizers import COBYLA
 from qiskit.aqua.algorithms import VQE
 from qiskit.aqua.operators import Z, X
 from scipy.optimize import minimize
 
 class QuantumAgent:
-    def __init__(self, n_qubits):
+    def __init__(self, n_qubits, mode='shots', shots=1024):
+        if mode not in ('shots', 'exact'):
+            raise ValueError("Unsupported objective mode.")
         self.n_qubits = n_qubits
+        self.mode = mode
+        self.shots = shots
         self.theta = Parameter('θ')
         self.env_qubits = QuantumRegister(n_qubits, name='env')
         self.agent_qubits = QuantumRegister(1, name='agent')
@@ -24,19 +29,33 @@ class QuantumAgent:
         for qubit in range(n_qubits):
             self.circuit.cx(self.agent_qubits, self.env_qubits[qubit])
         self.circuit.h(self.agent_qubits)
+        self.state_circuit = self.circuit.copy()
         self.c_reg = ClassicalRegister(1, name='c_reg')
         self.circuit.add_register(self.c_reg)
         self.circuit.measure(self.agent_qubits, self.c_reg)
 
     def objective_function(self, theta):
+        if self.mode == 'exact':
+            return self.exact_probability(theta)
         backend = Aer.get_backend('qasm_simulator')
-        job = execute(self.circuit.bind_parameters({self.theta: theta}), backend, shots=1024)
+        job = execute(self.circuit.bind_parameters({self.theta: theta}), backend, shots=self.shots)
         result = job.result().get_counts(self.circuit)
         if '1' in result:
-            return result['1'] / 1024
+            return result['1'] / self.shots
         else:
             return 0
 
+    def exact_probability(self, theta):
+        theta = float(np.ravel(theta)[0])
+        statevector = Statevector.from_instruction(self.state_circuit.bind_parameters({self.theta: theta}))
+        return statevector.probabilities([self.n_qubits])[1]
+
+    def exact_probabilities(self, thetas):
+        # The CNOT fan-out turns the agent into a GHZ state, so the n + 1 RZ gates add up to a
+        # single relative phase of (n + 1) * theta and P(agent=1) = sin^2((n + 1) * theta / 2)
+        thetas = np.asarray(thetas, dtype=float)
+        return np.sin((self.n_qubits + 1) * thetas / 2) ** 2
+
     def optimize(self):
         optimizer = COBYLA(maxiter=500, tol=0.0001)
         initial_theta = 0.01
@@ -61,7 +80,7 @@ class Environment:
 def main():
     n_qubits = 4
     env = Environment(n_qubits)
-    agent = QuantumAgent(n_qubits)
+    agent = QuantumAgent(n_qubits, mode='exact')
     total_episodes = 100
     rewards = []
 
@@ -0,0 +1,36 @@
+# src/utility_frameworks/circuit_fingerprints.py
+
+import hashlib
+import numpy as np
+from qiskit.circuit import ClassicalRegister
+
+# Instructions whose name fully determines their action; anything else is fingerprinted through its definition
+STANDARD_INSTRUCTIONS = {
+    'id', 'x', 'y', 'z', 'h', 's', 'sdg', 't', 'tdg', 'sx', 'sxdg', 'rx', 'ry', 'rz', 'p', 'u', 'u1', 'u2', 'u3',
+    'cx', 'cy', 'cz', 'ch', 'swap', 'ccx', 'cswap', 'crx', 'cry', 'crz', 'cp', 'cu1', 'cu3', 'rxx', 'ryy', 'rzz',
+    'measure', 'barrier', 'reset', 'unitary'
+}
+
+def condition_key(condition, clbit_indices):
+    if condition is None:
+        return None
+    target, value = condition
+    bits = list(target) if isinstance(target, ClassicalRegister) else [target]
+    return [clbit_indices[bit] for bit in bits], int(value)
+
+def circuit_fingerprint(circuit):
+    qubit_indices = {qubit: index for index, qubit in enumerate(circuit.qubits)}
+    clbit_indices = {clbit: index for index, clbit in enumerate(circuit.clbits)}
+    digest = hashlib.sha256()
+    digest.update(repr([(register.name, register.size) for register in circuit.qregs + circuit.cregs]).encode())
+    digest.update(repr(circuit.global_phase).encode())
+    for instruction, qargs, cargs in circuit.data:
+        params = [hashlib.sha256(np.ascontiguousarray(param).tobytes()).hexdigest() if isinstance(param, np.ndarray) else repr(param)
+                  for param in instruction.params]
+        definition = ''
+        if instruction.name not in STANDARD_INSTRUCTIONS and instruction.definition is not None:
+            definition = circuit_fingerprint(instruction.definition)
+        condition = condition_key(getattr(instruction, 'condition', None), clbit_indices)
+        digest.update(repr((instruction.name, [qubit_indices[qubit] for qubit in qargs],
+                            [clbit_indices[clbit] for clbit in cargs], params, definition, condition)).encode())
+    return digest.hexdigest()
@@ -5,6 +5,7 @@ from qiskit import QuantumCircuit, Aer, transpile, execute
 from qiskit.circuit import Parameter
 from qiskit.providers.aer import AerSimulator
 from qiskit.quantum_info import Statevector
+from circuit_fingerprints import circuit_fingerprint
 
 class DynamicQuantumCircuit:
     def __init__(self, n_qubits, depth):
@@ -12,8 +13,12 @@ class DynamicQuantumCircuit:
         self.depth = depth
         self.parameters = [Parameter(f'theta_{i}') for i in range(self.depth * self.n_qubits)]
         self.circuit = QuantumCircuit(n_qubits)
+        self.simulator = None
+        self.compiled_template = None
+        self.compiled_template_key = None
 
     def build_circuit(self):
+        self.compiled_template = None
         param_iter = iter(self.parameters)
         for _ in range(self.depth):
             for qubit in range(self.n_qubits):
@@ -37,18 +42,48 @@ class DynamicQuantumCircuit:
         statevector = Statevector.from_instruction(compiled_circuit)
         return statevector
 
+    def compile_template(self):
+        # Transpile the parameterized circuit once; parameter sets are bound by Aer at run time.
+        # The key catches a replaced or edited circuit, and the parameter objects must match for Aer to bind them.
+        key = (circuit_fingerprint(self.circuit), tuple(self.circuit.parameters))
+        if self.compiled_template is None or self.compiled_template_key != key:
+            self.simulator = AerSimulator(method='statevector')
+            template = self.circuit.copy()
+            template.save_statevector()
+            self.compiled_template = transpile(template, self.simulator)
+            self.compiled_template_key = key
+        return self.compiled_template
+
+    def simulate_batch(self, param_sets):
+        param_sets = np.atleast_2d(np.asarray(param_sets, dtype=float))
+        if param_sets.shape[1] != len(self.parameters):
+            raise ValueError(f"Expected parameter sets of length {len(self.parameters)}, got {param_sets.shape[1]}.")
+        compiled_template = self.compile_template()
+        parameter_binds = [{param: list(param_sets[:, i]) for i, param in enumerate(self.parameters)}]
+        result = self.simulator.run(compiled_template, parameter_binds=parameter_binds).result()
+        statevectors = np.array([np.asarray(result.get_statevector(i)) for i in range(len(param_sets))])
+        return statevectors
+
+    def evaluate_batch(self, param_sets, objective_function):
+        statevectors = self.simulate_batch(param_sets)
+        return np.array([objective_function(Statevector(statevector)) for statevector in statevectors])
+
 def optimize_circuit(dynamic_circuit, objective_function, initial_params):
     from scipy.optimize import minimize
 
     def cost_function(params):
-        updated_circuit = dynamic_circuit.update_circuit_params(params)
-        statevector = dynamic_circuit.simulate_circuit(updated_circuit)
-        cost = objective_function(statevector)
+        cost = dynamic_circuit.evaluate_batch([params], objective_function)[0]
         return cost
 
     result = minimize(cost_function, initial_params, method='COBYLA')
     return result
 
+def parameter_sweep(dynamic_circuit, objective_function, param_sets):
+    param_sets = np.atleast_2d(np.asarray(param_sets, dtype=float))
+    costs = dynamic_circuit.evaluate_batch(param_sets, objective_function)
+    best_index = int(np.argmin(costs))
+    return param_sets[best_index], costs
+
 def example_objective_function(statevector):
     target_state = Statevector.from_label('0' * dynamic_circuit.n_qubits)
     fidelity = abs(statevector.inner(target_state))**2
@@ -65,3 +100,8 @@ if __name__ == '__main__':
     result = optimize_circuit(dynamic_circuit, example_objective_function, initial_params)
     print(f"Optimized parameters: {result.x}")
     print(f"Minimum cost: {result.fun}")
+
+    sweep_params = np.random.rand(256, n_qubits * depth) * 2 * np.pi
+    best_params, sweep_costs = parameter_sweep(dynamic_circuit, example_objective_function, sweep_params)
+    print(f"Best sweep parameters: {best_params}")
+    print(f"Best sweep cost: {sweep_costs.min()}")
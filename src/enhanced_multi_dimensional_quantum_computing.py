@@ -1,15 +1,26 @@
 # src/quantum_innovations/multi_dimensional_quantum_computing.py
 
+import time
 import numpy as np
-from qiskit import QuantumCircuit, QuantumRegister, transpile, Aer, execute
+from collections import OrderedDict
+from qiskit import QuantumCircuit, QuantumRegister, transpile, Aer, execute, assemble
+from qiskit.extensions import UnitaryGate
 from qiskit.quantum_info import Operator
 from qiskit.circuit.library import QFT, RZGate, RYGate
 from itertools import product
+from circuit_fingerprints import circuit_fingerprint
+
+NON_UNITARY_INSTRUCTIONS = ('measure', 'barrier', 'reset', 'initialize')
 
 class EnhancedMultiDimensionalQC:
-    def __init__(self, qubits_per_dimension, dimensions):
+    # Shared across instances so repeated simulations of one configuration compile only once
+    compiled_cache = OrderedDict()
+    compiled_cache_size = 64
+
+    def __init__(self, qubits_per_dimension, dimensions, max_fused_qubits=5):
         self.qubits_per_dimension = qubits_per_dimension
         self.dimensions = dimensions
+        self.max_fused_qubits = max_fused_qubits
         self.total_qubits = qubits_per_dimension * dimensions
         self.quantum_register = QuantumRegister(self.total_qubits, name='qreg')
         self.circuit = QuantumCircuit(self.quantum_register)
@@ -32,10 +43,63 @@ class EnhancedMultiDimensionalQC:
                 target_qubit = dim_pair[1] * self.qubits_per_dimension
                 self.circuit.cx(control_qubit, target_qubit)
 
-    def simulate(self, shots=1024):
+    def gate_sequence(self):
+        # Composite gates are fingerprinted through their definitions, a shared name is not enough
+        return circuit_fingerprint(self.circuit)
+
+    def fuse_circuit(self):
+        # Greedily merge consecutive gates into unitaries acting on at most max_fused_qubits qubits
+        fused_circuit = QuantumCircuit(*self.circuit.qregs, *self.circuit.cregs)
+        block_qubits = []
+        block_instructions = []
+
+        def flush_block():
+            if len(block_instructions) == 1:
+                fused_circuit.append(*block_instructions[0])
+            elif block_instructions:
+                local_indices = {qubit: index for index, qubit in enumerate(block_qubits)}
+                block = QuantumCircuit(len(block_qubits))
+                for instruction, qargs, _ in block_instructions:
+                    block.append(instruction, [local_indices[qubit] for qubit in qargs])
+                fused_circuit.append(UnitaryGate(Operator(block), label='fused'), list(block_qubits))
+            block_qubits.clear()
+            block_instructions.clear()
+
+        for instruction, qargs, cargs in self.circuit.data:
+            if instruction.name in NON_UNITARY_INSTRUCTIONS or cargs:
+                flush_block()
+                fused_circuit.append(instruction, qargs, cargs)
+                continue
+            merged_qubits = block_qubits + [qubit for qubit in qargs if qubit not in block_qubits]
+            if len(merged_qubits) > self.max_fused_qubits:
+                flush_block()
+                merged_qubits = list(qargs)
+            block_qubits[:] = merged_qubits
+            block_instructions.append((instruction, qargs, cargs))
+        flush_block()
+
+        return fused_circuit
+
+    def compile(self, backend):
+        key = (self.qubits_per_dimension, self.dimensions, self.max_fused_qubits, backend.name(), self.gate_sequence())
+        if key in self.compiled_cache:
+            self.compiled_cache.move_to_end(key)
+            return self.compiled_cache[key]
+        compiled_circuit = transpile(self.fuse_circuit(), backend)
+        self.compiled_cache[key] = compiled_circuit
+        if len(self.compiled_cache) > self.compiled_cache_size:
+            self.compiled_cache.popitem(last=False)
+        return compiled_circuit
+
+    def simulate(self, shots=1024, fuse=True):
         backend = Aer.get_backend('qasm_simulator')
-        compiled_circuit = transpile(self.circuit, backend)
-        job = execute(compiled_circuit, backend, shots=shots)
+        if fuse:
+            # Run the cached circuit as-is, execute() would transpile it again
+            compiled_circuit = self.compile(backend)
+            job = backend.run(assemble(compiled_circuit, shots=shots))
+        else:
+            compiled_circuit = transpile(self.circuit, backend)
+            job = execute(compiled_circuit, backend, shots=shots)
         result = job.result().get_counts()
         return result
 
@@ -52,6 +116,36 @@ def apply_custom_dimensional_gates(emdqc, custom_gate):
                               emdqc.quantum_register[dim_start:dim_start + emdqc.qubits_per_dimension], 
                               label='CustomGate')
 
+def build_example_circuit(qubits_per_dimension, dimensions, max_fused_qubits=5):
+    emdqc = EnhancedMultiDimensionalQC(qubits_per_dimension, dimensions, max_fused_qubits=max_fused_qubits)
+    emdqc.apply_dimensional_qft()
+    emdqc.apply_controlled_rotation()
+    emdqc.apply_interdimensional_entanglement()
+    apply_custom_dimensional_gates(emdqc, create_custom_gate(qubits_per_dimension))
+    emdqc.circuit.measure_all()
+    return emdqc
+
+def benchmark_fusion(qubits_per_dimension=2, dimension_counts=(4, 6, 8), shots=1024, repeats=5):
+    for dimensions in dimension_counts:
+        emdqc = build_example_circuit(qubits_per_dimension, dimensions)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            emdqc.simulate(shots=shots, fuse=False)
+        unfused_time = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        emdqc.simulate(shots=shots, fuse=True)
+        first_fused_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            emdqc.simulate(shots=shots, fuse=True)
+        cached_fused_time = (time.perf_counter() - start) / repeats
+
+        print(f"{dimensions} dimensions: unfused {unfused_time:.4f} s, "
+              f"fused (compile) {first_fused_time:.4f} s, fused (cached) {cached_fused_time:.4f} s")
+
 def main():
     qubits_per_dimension = 2
     dimensions = 3
@@ -72,6 +166,7 @@ def main():
     apply_custom_dimensional_gates(emdqc, custom_gate)
 
     # Simulate the circuit
+    emdqc.circuit.measure_all()
     simulation_result = emdqc.simulate(shots=1024)
     print("Simulation result:", simulation_result)
 
@@ -6,8 +6,12 @@ from qiskit.extensions import UnitaryGate
 from scipy.linalg import block_diag
 
 class MultiDimensionalQuantumSystem:
-    def __init__(self, dimensions):
+    def __init__(self, dimensions, mode='circuit'):
+        if mode not in ('circuit', 'tensor'):
+            raise ValueError("Unsupported simulation mode.")
         self.dimensions = dimensions
+        self.mode = mode
+        self.state = None
         self.qubits_needed = np.ceil(np.log2(np.sum(dimensions)))
         self.qreg = QuantumRegister(int(self.qubits_needed), 'qreg')
         self.circuit = QuantumCircuit(self.qreg)
@@ -16,6 +20,11 @@ class MultiDimensionalQuantumSystem:
         total_states = np.prod(self.dimensions)
         if state_index >= total_states:
             raise ValueError("State index exceeds the total number of states in the multidimensional system.")
+        if self.mode == 'tensor':
+            # Mixed-radix state tensor with one axis per dimension, dimension 0 being the most significant
+            self.state = np.zeros(self.dimensions, dtype=complex)
+            self.state[np.unravel_index(state_index, self.dimensions)] = 1
+            return
         initialization_vector = np.zeros((int(2**self.qubits_needed),))
         initialization_vector[state_index] = 1
         self.circuit.initialize(initialization_vector, self.qreg)
@@ -23,14 +32,32 @@ class MultiDimensionalQuantumSystem:
     def apply_generalized_gate(self, gate_matrix, target_dimension):
         if target_dimension >= len(self.dimensions):
             raise ValueError("Target dimension exceeds the available dimensions of the system.")
-        
+        if self.mode == 'tensor':
+            self.apply_tensor_gate(gate_matrix, target_dimension)
+            return
+
         identity_sizes = [np.prod(self.dimensions[:target_dimension]), 
                           np.prod(self.dimensions[target_dimension + 1:])]
         full_gate_matrix = block_diag(np.eye(int(identity_sizes[0])), gate_matrix, np.eye(int(identity_sizes[1])))
         gate = UnitaryGate(full_gate_matrix)
         self.circuit.append(gate, self.qreg)
 
+    def apply_tensor_gate(self, gate_matrix, target_dimension):
+        # Contract the gate with the target axis only, the full operator is never materialized
+        gate_matrix = np.asarray(gate_matrix, dtype=complex)
+        target_size = self.dimensions[target_dimension]
+        if gate_matrix.shape != (target_size, target_size):
+            raise ValueError("Gate matrix does not match the size of the target dimension.")
+        if self.state is None:
+            self.initialize_state(0)
+        evolved = np.tensordot(gate_matrix, self.state, axes=([1], [target_dimension]))
+        self.state = np.moveaxis(evolved, 0, target_dimension)
+
     def measure_system(self):
+        if self.mode == 'tensor':
+            if self.state is None:
+                self.initialize_state(0)
+            return self.state.reshape(-1)
         simulator = Aer.get_backend('statevector_simulator')
         result = execute(self.circuit, simulator).result()
         statevector = result.get_statevector()
@@ -51,5 +78,12 @@ def example_usage():
     final_statevector = md_system.measure_system()
     print(f"Final statevector: {final_statevector}")
 
+    # Tensor mode scales to larger registers since only the state tensor is stored
+    large_system = MultiDimensionalQuantumSystem([4, 5, 6, 7, 8], mode='tensor')
+    large_system.initialize_state(state_index)
+    for target_dimension, dimension in enumerate(large_system.dimensions):
+        large_system.apply_generalized_gate(np.roll(np.eye(dimension), 1, axis=0), target_dimension)
+    print(f"Large system amplitude count: {large_system.measure_system().size}")
+
 if __name__ == "__main__":
     example_usage()
@@ -0,0 +1,150 @@
+# src/utility_frameworks/numpy_statevector_simulator.py
+
+import time
+import numpy as np
+from qiskit import QuantumCircuit, Aer, execute
+from qiskit.circuit.exceptions import CircuitError
+from qiskit.quantum_info import Operator
+from circuit_fingerprints import STANDARD_INSTRUCTIONS
+
+class NumpyStatevectorSimulator:
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.matrix_cache = {}
+
+    def gate_matrix(self, instruction):
+        # Only standard gates are cached, composites like mcx, QFT or custom gates can share a name across widths or definitions
+        key = None
+        if instruction.name in STANDARD_INSTRUCTIONS:
+            try:
+                key = (instruction.name, instruction.num_qubits, tuple(float(param) for param in instruction.params))
+            except (TypeError, ValueError):
+                key = None
+        if key is not None and key in self.matrix_cache:
+            return self.matrix_cache[key]
+
+        try:
+            matrix = np.asarray(instruction.to_matrix(), dtype=complex)
+        except (AttributeError, CircuitError):
+            matrix = Operator(instruction).data
+        if key is not None:
+            self.matrix_cache[key] = matrix
+        return matrix
+
+    def apply_single_qubit_gate(self, state, matrix, qubit):
+        # Little-endian ordering: the target qubit is the middle axis of a (high, 2, low) view
+        view = state.reshape(-1, 2, 2 ** qubit)
+        zero = view[:, 0, :].copy()
+        view[:, 0, :] *= matrix[0, 0]
+        view[:, 0, :] += matrix[0, 1] * view[:, 1, :]
+        view[:, 1, :] *= matrix[1, 1]
+        view[:, 1, :] += matrix[1, 0] * zero
+
+    def apply_multi_qubit_gate(self, state, matrix, qubits, num_qubits):
+        num_targets = len(qubits)
+        tensor = state.reshape([2] * num_qubits)
+        axes = [num_qubits - 1 - qubit for qubit in reversed(qubits)]
+        gate = matrix.reshape([2] * (2 * num_targets))
+        evolved = np.tensordot(gate, tensor, axes=(list(range(num_targets, 2 * num_targets)), axes))
+        state[:] = np.moveaxis(evolved, list(range(num_targets)), axes).reshape(-1)
+
+    def evolve(self, circuit):
+        num_qubits = circuit.num_qubits
+        qubit_indices = {qubit: index for index, qubit in enumerate(circuit.qubits)}
+        clbit_indices = {clbit: index for index, clbit in enumerate(circuit.clbits)}
+        state = np.zeros(2 ** num_qubits, dtype=complex)
+        state[0] = 1
+        measurements = []
+
+        for instruction, qargs, cargs in circuit.data:
+            qubits = [qubit_indices[qubit] for qubit in qargs]
+            if instruction.name == 'barrier':
+                continue
+            if instruction.name == 'measure':
+                measurements.append((qubits[0], clbit_indices[cargs[0]]))
+                continue
+            if measurements:
+                raise ValueError("Only terminal measurements are supported by the NumPy statevector simulator.")
+            if instruction.is_parameterized():
+                raise ValueError("Circuit contains unbound parameters.")
+            if instruction.name == 'initialize':
+                if qubits != list(range(num_qubits)):
+                    raise ValueError("Initialize is only supported on the full register.")
+                state[:] = np.asarray(instruction.params, dtype=complex)
+                continue
+
+            matrix = self.gate_matrix(instruction)
+            if len(qubits) == 1:
+                self.apply_single_qubit_gate(state, matrix, qubits[0])
+            else:
+                self.apply_multi_qubit_gate(state, matrix, qubits, num_qubits)
+
+        return state, measurements
+
+    def get_statevector(self, circuit):
+        # Measurements are ignored, the pre-measurement state is returned
+        state, _ = self.evolve(circuit)
+        return state
+
+    def get_counts(self, circuit, shots=1024):
+        state, measurements = self.evolve(circuit)
+        probabilities = np.abs(state) ** 2
+        probabilities /= probabilities.sum()
+        basis_counts = self.rng.multinomial(shots, probabilities)
+
+        counts = {}
+        for basis_state in np.flatnonzero(basis_counts):
+            clbit_value = 0
+            for qubit, clbit in measurements:
+                clbit_value |= ((int(basis_state) >> qubit) & 1) << clbit
+            key = self.format_clbits(circuit, clbit_value)
+            counts[key] = counts.get(key, 0) + int(basis_counts[basis_state])
+        return counts
+
+    def format_clbits(self, circuit, clbit_value):
+        clbit_indices = {clbit: index for index, clbit in enumerate(circuit.clbits)}
+        register_strings = []
+        for register in reversed(circuit.cregs):
+            register_strings.append(''.join(str((clbit_value >> clbit_indices[clbit]) & 1) for clbit in reversed(list(register))))
+        return ' '.join(register_strings)
+
+def create_benchmark_circuit(num_qubits, depth, seed=None):
+    rng = np.random.default_rng(seed)
+    circuit = QuantumCircuit(num_qubits)
+    for _ in range(depth):
+        for qubit in range(num_qubits):
+            circuit.rx(rng.uniform(-np.pi, np.pi), qubit)
+            circuit.rz(rng.uniform(-np.pi, np.pi), qubit)
+        for qubit in range(num_qubits - 1):
+            circuit.cx(qubit, qubit + 1)
+    return circuit
+
+def time_call(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+def benchmark_against_aer(qubit_counts=range(2, 21, 2), depth=5, repeats=20):
+    numpy_simulator = NumpyStatevectorSimulator()
+    aer_backend = Aer.get_backend('statevector_simulator')
+    timings = []
+    for num_qubits in qubit_counts:
+        circuit = create_benchmark_circuit(num_qubits, depth, seed=num_qubits)
+        numpy_time = time_call(lambda: numpy_simulator.get_statevector(circuit), repeats)
+        aer_time = time_call(lambda: execute(circuit, aer_backend).result().get_statevector(), repeats)
+        timings.append((num_qubits, numpy_time, aer_time))
+        print(f"{num_qubits:>3} qubits: numpy {numpy_time * 1e3:9.3f} ms, aer {aer_time * 1e3:9.3f} ms")
+
+    crossover = next((num_qubits for num_qubits, numpy_time, aer_time in timings if aer_time < numpy_time), None)
+    if crossover is None:
+        print("NumPy engine was faster at every benchmarked size.")
+    else:
+        print(f"Aer becomes faster at {crossover} qubits.")
+    return timings, crossover
+
+def main():
+    benchmark_against_aer()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,88 @@
 # src/quantum_innovations/photonic_quantum_systems.py
 
 import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from strawberryfields.apps import data, sample, plot
 import strawberryfields as sf
 from strawberryfields.ops import *
 from thewalrus.quantum import photon_number_mean, photon_number_covmat
 
+SAMPLING_PROGRAMS = {}
+
+def prepare_modes(q, num_modes, mean_photon_number):
+    for i in range(num_modes):
+        Squeezed(r=np.sqrt(mean_photon_number)) | q[i]
+    for i in range(num_modes - 1):
+        BSgate(phi=np.pi/4) | (q[i], q[i+1])
+
+def sampling_program(num_modes, mean_photon_number):
+    # Compiled once per process and reused for every chunk
+    key = (num_modes, float(mean_photon_number))
+    if key not in SAMPLING_PROGRAMS:
+        program = sf.Program(num_modes)
+        with program.context as q:
+            prepare_modes(q, num_modes, mean_photon_number)
+            MeasureFock() | q
+        SAMPLING_PROGRAMS[key] = program.compile(compiler="gaussian")
+    return SAMPLING_PROGRAMS[key]
+
+def sample_fock_chunk(job):
+    num_modes, mean_photon_number, chunk_size, seed = job
+    # The gaussian sampler draws from the global NumPy RNG; restore it so serial callers see no reseeding
+    caller_state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        eng = sf.Engine(backend="gaussian")
+        result = eng.run(sampling_program(num_modes, mean_photon_number), shots=chunk_size)
+    finally:
+        np.random.set_state(caller_state)
+    return np.asarray(result.samples, dtype=np.int64).reshape(chunk_size, num_modes)
+
+def squeezed_vacuum_covariances(squeezing, hbar=2):
+    # squeezing has shape (points, modes); covariances use xxpp ordering
+    squeezing = np.asarray(squeezing, dtype=float)
+    num_modes = squeezing.shape[-1]
+    covariances = np.zeros(squeezing.shape[:-1] + (2 * num_modes, 2 * num_modes))
+    modes = np.arange(num_modes)
+    covariances[..., modes, modes] = hbar / 2 * np.exp(-2 * squeezing)
+    covariances[..., modes + num_modes, modes + num_modes] = hbar / 2 * np.exp(2 * squeezing)
+    return covariances
+
+def beamsplitter_symplectics(theta, phi, mode_a, mode_b, num_modes):
+    theta, phi = np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(phi, dtype=float))
+    ct, st = np.cos(theta), np.sin(theta)
+    cp, sp = np.cos(phi), np.sin(phi)
+    block = np.stack([
+        np.stack([ct, -cp * st, np.zeros_like(ct), -st * sp], axis=-1),
+        np.stack([cp * st, ct, -st * sp, np.zeros_like(ct)], axis=-1),
+        np.stack([np.zeros_like(ct), st * sp, ct, -cp * st], axis=-1),
+        np.stack([st * sp, np.zeros_like(ct), cp * st, ct], axis=-1),
+    ], axis=-2)
+    indices = np.array([mode_a, mode_b, mode_a + num_modes, mode_b + num_modes])
+    symplectics = np.broadcast_to(np.eye(2 * num_modes), theta.shape + (2 * num_modes, 2 * num_modes)).copy()
+    symplectics[..., indices[:, None], indices[None, :]] = block
+    return symplectics
+
+def beamsplitter_chain_symplectics(theta, phi, num_modes):
+    # Same chain as setup_system: a beamsplitter on each neighbouring pair (i, i+1), in order
+    theta, phi = np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(phi, dtype=float))
+    symplectics = np.broadcast_to(np.eye(2 * num_modes), theta.shape + (2 * num_modes, 2 * num_modes)).copy()
+    for i in range(num_modes - 1):
+        symplectics = beamsplitter_symplectics(theta, phi, i, i + 1, num_modes) @ symplectics
+    return symplectics
+
+def batch_photon_statistics(covariances, hbar=2):
+    # Zero-displacement Gaussian states, stacked along the leading axes
+    num_modes = covariances.shape[-1] // 2
+    xx = covariances[..., :num_modes, :num_modes]
+    xp = covariances[..., :num_modes, num_modes:]
+    px = covariances[..., num_modes:, :num_modes]
+    pp = covariances[..., num_modes:, num_modes:]
+    mean_photon = (np.diagonal(xx, axis1=-2, axis2=-1) + np.diagonal(pp, axis1=-2, axis2=-1)) / (2 * hbar) - 0.5
+    cov_photon = (xx ** 2 + xp ** 2 + px ** 2 + pp ** 2) / (2 * hbar ** 2) - np.eye(num_modes) / 4
+    return mean_photon, cov_photon
+
 class PhotonicQuantumSystem:
     def __init__(self, num_modes, mean_photon_number):
         self.num_modes = num_modes
@@ -15,10 +92,7 @@ class PhotonicQuantumSystem:
 
     def setup_system(self):
         with self.program.context as q:
-            for i in range(self.num_modes):
-                Squeezed(r=np.sqrt(self.mean_photon_number)) | q[i]
-            for i in range(self.num_modes - 1):
-                BSgate(phi=np.pi/4) | (q[i], q[i+1])
+            prepare_modes(q, self.num_modes, self.mean_photon_number)
 
     def run_simulation(self):
         state = self.eng.run(self.program).state
@@ -30,13 +104,53 @@ class PhotonicQuantumSystem:
         cov_photon = photon_number_covmat(cov_matrix, hbar=sf.hbar)
         return mean_photon, cov_photon
 
-    def generate_samples(self, shots=1000):
-        with self.program.context as q:
-            MeasureFock() | q
+    def sample_jobs(self, shots, chunk_size, seed=None):
+        chunk_sizes = [min(chunk_size, shots - start) for start in range(0, shots, chunk_size)]
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(chunk_sizes))]
+        return [(self.num_modes, self.mean_photon_number, size, chunk_seed) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    def stream_samples(self, shots, chunk_size=1000, num_workers=None, seed=None, max_pending=None):
+        # Yields (chunk_size, num_modes) arrays in order; at most max_pending chunks are held in memory
+        jobs = self.sample_jobs(shots, chunk_size, seed)
+        if not num_workers:
+            for job in jobs:
+                yield sample_fock_chunk(job)
+            return
 
-        result = self.eng.run(self.program, shots=shots)
-        samples = result.samples
-        return samples
+        max_pending = max_pending or 2 * num_workers
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            for job in jobs:
+                pending.append(executor.submit(sample_fock_chunk, job))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def sweep_statistics(self, squeezing, thetas=(np.pi/4,), phis=(np.pi/4,), num_modes=None):
+        # Grid over (squeezing, theta, phi) computed from stacked covariance matrices, no sf.Program per point.
+        # The defaults match setup_system, where BSgate(phi=pi/4) keeps its default theta of pi/4.
+        num_modes = num_modes or self.num_modes
+        squeezing_grid, theta_grid, phi_grid = np.meshgrid(np.asarray(squeezing, dtype=float), np.asarray(thetas, dtype=float),
+                                                           np.asarray(phis, dtype=float), indexing='ij')
+        initial = squeezed_vacuum_covariances(np.repeat(squeezing_grid[..., None], num_modes, axis=-1), hbar=sf.hbar)
+        symplectics = beamsplitter_chain_symplectics(theta_grid, phi_grid, num_modes)
+        covariances = symplectics @ initial @ np.swapaxes(symplectics, -1, -2)
+        mean_photon, cov_photon = batch_photon_statistics(covariances, hbar=sf.hbar)
+        return {
+            'squeezing': squeezing_grid,
+            'theta': theta_grid,
+            'phi': phi_grid,
+            'covariances': covariances,
+            'mean_photon': mean_photon,
+            'cov_photon': cov_photon,
+        }
+
+    def generate_samples(self, shots=1000, chunk_size=1000, num_workers=None, seed=None):
+        chunks = list(self.stream_samples(shots, chunk_size=chunk_size, num_workers=num_workers, seed=seed))
+        if not chunks:
+            return np.empty((0, self.num_modes), dtype=np.int64)
+        return np.concatenate(chunks)
 
 def main():
     num_modes = 4
@@ -50,6 +164,10 @@ def main():
     print(f"Mean photon number per mode: {mean_photon}")
     print(f"Covariance matrix of photon numbers: \n{cov_photon}")
 
+    sweep = photonic_system.sweep_statistics(np.sqrt(np.linspace(0.1, 2.0, 20)), thetas=np.linspace(0, np.pi/2, 9))
+    print(f"Swept {sweep['mean_photon'].shape[:-1]} points, total mean photon number range: "
+          f"{sweep['mean_photon'].sum(axis=-1).min():.3f} - {sweep['mean_photon'].sum(axis=-1).max():.3f}")
+
     # Generating samples
     shots = 1000
     samples = photonic_system.generate_samples(shots=shots)
@@ -59,5 +177,14 @@ def main():
     total_photons = np.sum(samples, axis=1)
     plot.histogram(total_photons, xlabel="Total Photon Number", ylabel="Frequency")
 
+    # Streaming a large run keeps only the running histogram in memory
+    total_photon_counts = np.zeros(0, dtype=np.int64)
+    for chunk in photonic_system.stream_samples(100000, chunk_size=5000, num_workers=4, seed=1234):
+        chunk_counts = np.bincount(chunk.sum(axis=1))
+        if len(chunk_counts) > len(total_photon_counts):
+            total_photon_counts = np.pad(total_photon_counts, (0, len(chunk_counts) - len(total_photon_counts)))
+        total_photon_counts[:len(chunk_counts)] += chunk_counts
+    print(f"Total photon number counts over 100000 streamed samples: {total_photon_counts}")
+
 if __name__ == "__main__":
     main()
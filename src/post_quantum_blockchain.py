@@ -2,30 +2,575 @@
 
 import hashlib
 import binascii
-from pyqrllib.pyqrllib import shake128, shake256, xmss_fast
+import contextlib
+import fcntl
+import functools
+import json
+import mmap
+import multiprocessing
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pyqrllib.pyqrllib import xmss_fast
 from pyqrllib.pyqrllib import hstr2bin
 from qiskit import QuantumCircuit, execute, Aer
 
+@functools.lru_cache(maxsize=4096)
+def parse_public_key(public_key):
+    # Cached per process, so each public key is decoded once however many signatures it checks
+    return tuple(hstr2bin(public_key))
+
+def verify_signature(transaction, signature, public_key):
+    message = tuple(hashlib.sha256(transaction.encode()).digest())
+    try:
+        return bool(xmss_fast.XmssFast.verify(message, tuple(bytes.fromhex(signature)), parse_public_key(public_key)))
+    except ValueError:
+        return False
+
+def verify_chunk(items):
+    return [verify_signature(transaction, signature, public_key) for transaction, signature, public_key in items]
+
+class QrngEntropyPool:
+    def __init__(self, num_qubits=8, shots_per_batch=8192, capacity=65536, low_watermark=16384):
+        self.num_qubits = num_qubits
+        self.shots_per_batch = shots_per_batch
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.backend = Aer.get_backend('qasm_simulator')
+        self.circuit = QuantumCircuit(num_qubits, num_qubits)
+        self.circuit.h(range(num_qubits))
+        self.circuit.measure(range(num_qubits), range(num_qubits))
+        self.buffer = bytearray()
+        self.requested = 0
+        self.closed = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.refill_thread = threading.Thread(target=self.refill_loop, daemon=True)
+        self.refill_thread.start()
+
+    def sample_bytes(self):
+        # memory=True keeps every shot, so one job yields shots_per_batch * num_qubits random bits
+        memory = execute(self.circuit, self.backend, shots=self.shots_per_batch, memory=True).result().get_memory()
+        bits = ''.join(memory)
+        usable_bits = len(bits) - len(bits) % 8
+        return int(bits[:usable_bits], 2).to_bytes(usable_bits // 8, 'big')
+
+    def refill_loop(self):
+        while True:
+            with self.condition:
+                while not self.closed and len(self.buffer) >= max(self.low_watermark, self.requested):
+                    self.condition.wait()
+                if self.closed:
+                    return
+            while not self.closed and len(self.buffer) < max(self.capacity, self.requested):
+                try:
+                    entropy = self.sample_bytes()
+                except Exception as error:
+                    with self.condition:
+                        self.error = error
+                        self.condition.notify_all()
+                    return
+                with self.condition:
+                    self.buffer.extend(entropy)
+                    self.condition.notify_all()
+
+    def read(self, num_bytes):
+        with self.condition:
+            while len(self.buffer) < num_bytes:
+                if self.error is not None:
+                    raise RuntimeError("QRNG entropy refill failed.") from self.error
+                if self.closed:
+                    raise ValueError("Entropy pool is closed.")
+                self.requested = num_bytes
+                self.condition.notify_all()
+                self.condition.wait()
+            self.requested = 0
+            data = bytes(self.buffer[:num_bytes])
+            del self.buffer[:num_bytes]
+            if len(self.buffer) < self.low_watermark:
+                self.condition.notify_all()
+            return data
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.refill_thread.join()
+
+class XmssKeystore:
+    def __init__(self, directory, tree_height=10, reserve_batch=64):
+        self.directory = directory
+        self.tree_height = tree_height
+        self.reserve_batch = reserve_batch  # OTS indices reserved per disk write
+        self.keys = {}
+        self.lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key_path(self, key_id):
+        return os.path.join(self.directory, f"{key_id}.json")
+
+    @contextlib.contextmanager
+    def record_lock(self, key_id):
+        # Serializes record updates between processes sharing the keystore directory
+        with open(f"{self.key_path(key_id)}.lock", 'a') as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def read_record(self, key_id):
+        with open(self.key_path(key_id)) as handle:
+            return json.load(handle)
+
+    def write_record(self, key_id, record):
+        # Write a temporary file and atomically replace the old record, so a crash never leaves a torn file
+        path = self.key_path(key_id)
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(record, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def generate_key(self, key_id, seed=None):
+        with self.lock, self.record_lock(key_id):
+            if key_id in self.keys or os.path.exists(self.key_path(key_id)):
+                raise ValueError(f"Key {key_id} already exists.")
+            seed = bytes(seed) if seed is not None else os.urandom(48)
+            if len(seed) != 48:
+                raise ValueError("XMSS seeds must be 48 bytes.")
+            # Building the XmssFast object computes the full tree once; it is kept for all later signatures
+            xmss = xmss_fast.XmssFast(tuple(seed), self.tree_height)
+            record = {
+                'seed': seed.hex(),
+                'tree_height': self.tree_height,
+                'public_key': bytes(xmss.getPK()).hex(),
+                'reserved_index': 0
+            }
+            self.write_record(key_id, record)
+            self.keys[key_id] = {'xmss': xmss, 'record': record}
+            return record['public_key']
+
+    def load_key(self, key_id):
+        # Loaded at most once per keystore, a second XmssFast would restart from the on-disk reservation
+        with self.lock:
+            if key_id not in self.keys:
+                record = self.read_record(key_id)
+                xmss = xmss_fast.XmssFast(tuple(bytes.fromhex(record['seed'])), record['tree_height'])
+                # Indices below the reservation may have been used before the last shutdown or crash
+                xmss.setIndex(record['reserved_index'])
+                self.keys[key_id] = {'xmss': xmss, 'record': record}
+            return self.keys[key_id]
+
+    def public_key(self, key_id):
+        return self.load_key(key_id)['record']['public_key']
+
+    def remaining_signatures(self, key_id):
+        with self.lock:
+            key = self.load_key(key_id)
+            return 2 ** key['record']['tree_height'] - key['xmss'].getIndex()
+
+    def reserve(self, key_id, key):
+        with self.record_lock(key_id):
+            # Another process may have reserved further ahead, so continue from the reservation on disk
+            record = self.read_record(key_id)
+            max_signatures = 2 ** record['tree_height']
+            start = max(key['xmss'].getIndex(), record['reserved_index'])
+            if start >= max_signatures:
+                raise ValueError(f"Key {key_id} has no one-time signatures left.")
+            key['xmss'].setIndex(start)
+            record['reserved_index'] = min(start + self.reserve_batch, max_signatures)
+            self.write_record(key_id, record)
+            key['record'] = record
+
+    def sign(self, key_id, message):
+        with self.lock:
+            key = self.load_key(key_id)
+            if key['xmss'].getIndex() >= key['record']['reserved_index']:
+                # Persist the reservation before signing so an OTS index is never reused after a crash
+                self.reserve(key_id, key)
+            signature = key['xmss'].sign(tuple(message))
+            return bytes(signature)
+
+HASH_SIZE = 32
+BLOCK_HEADER = struct.Struct(f'<Q{HASH_SIZE}s{HASH_SIZE}sQ')  # index, previous hash, merkle root, nonce
+LENGTH_PREFIX = struct.Struct('<I')
+NONCE = struct.Struct('<Q')
+
+def shake_digest(data, security_level=256):
+    if security_level == 256:
+        return hashlib.shake_256(data).digest(HASH_SIZE)
+    return hashlib.shake_128(data).digest(HASH_SIZE)
+
+def encode_transaction(transaction):
+    # Transactions are text everywhere else (signing, block decoding), so bytes would not round-trip
+    if not isinstance(transaction, str):
+        raise TypeError(f"Transactions must be str, not {type(transaction).__name__}.")
+    return transaction.encode()
+
+class MerkleTree:
+    def __init__(self, security_level=256, transactions=()):
+        self.security_level = security_level
+        self.levels = [[]]
+        for transaction in transactions:
+            self.append(transaction)
+
+    def leaf_hash(self, transaction):
+        # Distinct leaf and node prefixes prevent passing an inner node off as a transaction
+        return shake_digest(b'\x00' + encode_transaction(transaction), self.security_level)
+
+    def node_hash(self, left, right):
+        return shake_digest(b'\x01' + left + right, self.security_level)
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def append(self, transaction):
+        # Only the rightmost path changes, an unpaired node is carried up to the next level unchanged
+        self.levels[0].append(self.leaf_hash(transaction))
+        level = 0
+        while len(self.levels[level]) > 1:
+            nodes = self.levels[level]
+            index = len(nodes) - 1
+            parent = self.node_hash(nodes[index - 1], nodes[index]) if index % 2 else nodes[index]
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            parents = self.levels[level + 1]
+            if index // 2 < len(parents):
+                parents[index // 2] = parent
+            else:
+                parents.append(parent)
+            level += 1
+
+    def root(self):
+        if not self.levels[0]:
+            return bytes(HASH_SIZE)
+        return self.levels[-1][0]
+
+    def proof(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("Transaction index out of range.")
+        path = []
+        for nodes in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(nodes):
+                path.append((nodes[sibling], sibling < index))
+            index //= 2
+        return path
+
+    def verify_proof(self, transaction, proof, root):
+        node = self.leaf_hash(transaction)
+        for sibling, sibling_is_left in proof:
+            node = self.node_hash(sibling, node) if sibling_is_left else self.node_hash(node, sibling)
+        return node == root
+
+def encode_block_header(block):
+    return BLOCK_HEADER.pack(block['index'], bytes.fromhex(block['previous_hash']),
+                             bytes.fromhex(block['merkle_root']), block['nonce'])
+
+def encode_block(block):
+    parts = [encode_block_header(block), bytes.fromhex(block['hash']), LENGTH_PREFIX.pack(len(block['transactions']))]
+    for transaction in block['transactions']:
+        encoded = encode_transaction(transaction)
+        parts.append(LENGTH_PREFIX.pack(len(encoded)))
+        parts.append(encoded)
+    return b''.join(parts)
+
+def decode_block(payload):
+    payload = memoryview(payload)
+    index, previous_hash, merkle_root, nonce = BLOCK_HEADER.unpack_from(payload, 0)
+    offset = BLOCK_HEADER.size
+    block_hash = bytes(payload[offset:offset + HASH_SIZE])
+    offset += HASH_SIZE
+    (num_transactions,) = LENGTH_PREFIX.unpack_from(payload, offset)
+    offset += LENGTH_PREFIX.size
+    transactions = []
+    for _ in range(num_transactions):
+        (length,) = LENGTH_PREFIX.unpack_from(payload, offset)
+        offset += LENGTH_PREFIX.size
+        transactions.append(bytes(payload[offset:offset + length]).decode())
+        offset += length
+    return {
+        'index': index,
+        'previous_hash': previous_hash.hex(),
+        'merkle_root': merkle_root.hex(),
+        'transactions': transactions,
+        'nonce': nonce,
+        'hash': block_hash.hex()
+    }
+
+def search_nonces(header_prefix, security_level, target, start_nonce, stride, stop_event, results, batch_size=4096):
+    # Absorb the constant header prefix once and only hash the nonce bytes per attempt
+    prefix_hasher = hashlib.shake_256() if security_level == 256 else hashlib.shake_128()
+    prefix_hasher.update(header_prefix)
+    nonce = start_nonce
+    hashes = 0
+    while not stop_event.is_set():
+        for _ in range(batch_size):
+            hasher = prefix_hasher.copy()
+            hasher.update(NONCE.pack(nonce))
+            digest = hasher.digest(HASH_SIZE)
+            hashes += 1
+            if int.from_bytes(digest, 'big') < target:
+                stop_event.set()
+                results.put((nonce, digest.hex(), hashes))
+                return
+            nonce += stride
+    results.put((None, None, hashes))
+
+def block_hash_key(block_hash):
+    return block_hash if isinstance(block_hash, str) else bytes(block_hash).hex()
+
+def block_hash_digest(block_hash):
+    digest = bytes.fromhex(block_hash) if isinstance(block_hash, str) else bytes(block_hash)
+    if len(digest) != HASH_SIZE:
+        raise ValueError("Block hashes must be HASH_SIZE bytes.")
+    return digest
+
+class BlockHashIndex:
+    # Open-addressing table of fixed-width slots, opening it maps the file without reading any entries
+    MAGIC = b'PQHX'
+    HEADER = struct.Struct('<4sQQ')  # magic, capacity, count
+    SLOT = struct.Struct(f'<{HASH_SIZE}sQ')  # block hash, block index + 1 (0 marks an empty slot)
+
+    def __init__(self, path, initial_capacity=1024, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        if not os.path.exists(path):
+            self.create(path, initial_capacity)
+        self.open()
+
+    def create(self, path, capacity):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as handle:
+            handle.write(self.HEADER.pack(self.MAGIC, capacity, 0))
+            handle.truncate(self.HEADER.size + capacity * self.SLOT.size)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+
+    def open(self):
+        self.file = open(self.path, 'r+b')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0)
+        except ValueError:
+            self.file.close()
+            raise
+        magic, self.capacity, self.count = self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or len(self.map) != self.HEADER.size + self.capacity * self.SLOT.size:
+            self.close()
+            raise ValueError(f"Corrupt block hash index {self.path}.")
+
+    def find_slot(self, digest):
+        position = int.from_bytes(digest[:8], 'little') % self.capacity
+        while True:
+            offset = self.HEADER.size + position * self.SLOT.size
+            key, value = self.SLOT.unpack_from(self.map, offset)
+            if value == 0 or key == digest:
+                return offset, value
+            position = (position + 1) % self.capacity
+
+    def get(self, digest):
+        _, value = self.find_slot(digest)
+        return value - 1 if value else None
+
+    def __contains__(self, digest):
+        return self.get(digest) is not None
+
+    def put(self, digest, index):
+        if (self.count + 1) * 2 > self.capacity:
+            self.resize(self.capacity * 2)
+        offset, value = self.find_slot(digest)
+        self.SLOT.pack_into(self.map, offset, digest, index + 1)
+        if not value:
+            self.count += 1
+            self.HEADER.pack_into(self.map, 0, self.MAGIC, self.capacity, self.count)
+        if self.fsync:
+            self.map.flush()
+
+    def entries(self):
+        for position in range(self.capacity):
+            key, value = self.SLOT.unpack_from(self.map, self.HEADER.size + position * self.SLOT.size)
+            if value:
+                yield key, value - 1
+
+    def resize(self, capacity):
+        # Built beside the live table and swapped in, a crash mid-resize leaves the old table intact
+        resized_path = f"{self.path}.resize"
+        self.create(resized_path, capacity)
+        resized = BlockHashIndex(resized_path)
+        for digest, index in self.entries():
+            resized.put(digest, index)
+        resized.map.flush()
+        resized.close()
+        self.close()
+        os.replace(resized_path, self.path)
+        self.open()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class MmapBlockStore:
+    RECORD_MAGIC = b'PQBK'
+    RECORD_HEADER = struct.Struct('<4sQI')  # magic, block index, payload length
+    OFFSET_ENTRY = struct.Struct('<Q')
+
+    def __init__(self, path, fsync=False):
+        self.fsync = fsync
+        self.data_file = open(f"{path}.blocks", 'a+b')
+        self.offsets_file = open(f"{path}.offsets", 'a+b')
+        self.data_map = None
+        self.offsets_map = None
+        self.recover()
+        self.hash_index = self.open_hash_index(f"{path}.hashes")
+        if self.length > 0:
+            last_hash = block_hash_digest(self[self.length - 1]['hash'])
+            if last_hash not in self.hash_index:
+                self.hash_index.put(last_hash, self.length - 1)
+
+    def open_hash_index(self, hash_path):
+        try:
+            return BlockHashIndex(hash_path, fsync=self.fsync)
+        except (ValueError, struct.error):
+            # Only a damaged table costs a scan of the chain; it is rebuilt from the blocks themselves
+            os.remove(hash_path)
+            hash_index = BlockHashIndex(hash_path, fsync=self.fsync)
+            for index in range(self.length):
+                hash_index.put(block_hash_digest(self[index]['hash']), index)
+            return hash_index
+
+    def recover(self):
+        # Appends write the record, then its offset, then its hash entry; drop anything a crash left half-written
+        offsets_size = os.fstat(self.offsets_file.fileno()).st_size
+        self.offsets_file.truncate(offsets_size - offsets_size % self.OFFSET_ENTRY.size)
+        self.length = offsets_size // self.OFFSET_ENTRY.size
+        if self.length == 0:
+            self.data_file.truncate(0)
+            self.data_size = 0
+            return
+        last_offset = self.offset(self.length - 1)
+        _, _, payload_length = self.RECORD_HEADER.unpack(self.read_data(last_offset, self.RECORD_HEADER.size))
+        self.data_size = last_offset + self.RECORD_HEADER.size + payload_length
+        self.data_file.truncate(self.data_size)
+
+    def remap(self, mapped, file, required_size):
+        if mapped is None or len(mapped) < required_size:
+            if mapped is not None:
+                mapped.close()
+            file.flush()
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def read_data(self, offset, size):
+        self.data_map = self.remap(self.data_map, self.data_file, offset + size)
+        return self.data_map[offset:offset + size]
+
+    def offset(self, index):
+        start = index * self.OFFSET_ENTRY.size
+        self.offsets_map = self.remap(self.offsets_map, self.offsets_file, start + self.OFFSET_ENTRY.size)
+        return self.OFFSET_ENTRY.unpack_from(self.offsets_map, start)[0]
+
+    def read_block(self, offset):
+        magic, _, payload_length = self.RECORD_HEADER.unpack(self.read_data(offset, self.RECORD_HEADER.size))
+        if magic != self.RECORD_MAGIC:
+            raise ValueError(f"Corrupt block record at offset {offset}.")
+        return decode_block(self.read_data(offset + self.RECORD_HEADER.size, payload_length))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Block index out of range.")
+        return self.read_block(self.offset(index))
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+    def append(self, block):
+        payload = encode_block(block)
+        offset = self.data_size
+        self.data_file.write(self.RECORD_HEADER.pack(self.RECORD_MAGIC, self.length, len(payload)) + payload)
+        self.data_file.flush()
+        if self.fsync:
+            os.fsync(self.data_file.fileno())
+        self.offsets_file.write(self.OFFSET_ENTRY.pack(offset))
+        self.offsets_file.flush()
+        if self.fsync:
+            os.fsync(self.offsets_file.fileno())
+        self.hash_index.put(block_hash_digest(block['hash']), self.length)
+        self.data_size = offset + self.RECORD_HEADER.size + len(payload)
+        self.length += 1
+
+    def get_by_hash(self, block_hash):
+        try:
+            digest = block_hash_digest(block_hash)
+            index = self.hash_index.get(digest)
+        except ValueError:
+            return None
+        # Entries past the recovered length belong to appends a crash cut short, and a later append can
+        # reuse such an index, so the stored block must also carry the requested hash
+        if index is None or index >= self.length:
+            return None
+        block = self[index]
+        if block_hash_digest(block['hash']) != digest:
+            return None
+        return block
+
+    def close(self):
+        for mapped in (self.data_map, self.offsets_map):
+            if mapped is not None:
+                mapped.close()
+        self.data_file.close()
+        self.offsets_file.close()
+        self.hash_index.close()
+
 class PostQuantumBlockchain:
-    def __init__(self, security_level=256):
+    def __init__(self, security_level=256, keystore=None, entropy_pool=None, block_store=None, difficulty_bits=0, mining_workers=None,
+                 verify_workers=None, merkle_cache_size=1024):
         self.security_level = security_level
-        self.blocks = []
+        self.difficulty_bits = difficulty_bits  # Required leading zero bits of a block hash
+        self.mining_workers = mining_workers
+        self.blocks = block_store if block_store is not None else []
         self.qrng_seed = None
+        self.entropy_pool = entropy_pool
+        self.owns_entropy_pool = False  # Only a pool the chain started itself is closed with it
         self.xmss_tree_height = 10  # Adjustable parameter for XMSS tree height
+        self.keystore = keystore
+        self.verify_workers = verify_workers  # 1 verifies in-process
+        self.verify_executor = None
+        self.merkle_trees = OrderedDict()  # block hash -> MerkleTree, most recently used last
+        self.merkle_cache_size = merkle_cache_size
 
     def generate_qrng_seed(self, n_bits=256):
-        circuit = QuantumCircuit(1, 1)  # Single qubit circuit
-        circuit.h(0)  # Apply Hadamard gate for superposition
-        circuit.measure(0, 0)  # Measure the qubit
-
-        backend = Aer.get_backend('qasm_simulator')
-        measurements = execute(circuit, backend, shots=n_bits).result().get_counts()
-
-        seed_bin = ''.join(['1' if measurements.get('1', 0) > measurements.get('0', 0) else '0' for _ in range(n_bits)])
-        self.qrng_seed = int(seed_bin, 2)
+        if self.entropy_pool is None:
+            self.entropy_pool = QrngEntropyPool()
+            self.owns_entropy_pool = True
+        num_bytes = (n_bits + 7) // 8
+        entropy = self.entropy_pool.read(num_bytes)
+        self.qrng_seed = int.from_bytes(entropy, 'big') >> (8 * num_bytes - n_bits)
         return self.qrng_seed
 
     def create_genesis_block(self):
+        if len(self.blocks) > 0:
+            raise ValueError("The chain already has a genesis block.")
         genesis_block = {
             'index': 0,
             'previous_hash': '0' * 64,
@@ -35,12 +580,106 @@ class PostQuantumBlockchain:
         genesis_block['hash'] = self.hash_block(genesis_block)
         self.blocks.append(genesis_block)
 
-    def hash_block(self, block):
-        block_string = f"{block['index']}{block['previous_hash']}{block['transactions']}{block['nonce']}"
-        if self.security_level == 256:
-            return shake256(256, binascii.unhexlify(block_string))
+    def merkle_root(self, transactions):
+        return MerkleTree(self.security_level, transactions).root().hex()
+
+    def checked_merkle_root(self, block):
+        # A stored root is never trusted, edited transactions must not hash to the original header
+        merkle_root = self.merkle_root(block['transactions'])
+        if block.setdefault('merkle_root', merkle_root) != merkle_root:
+            raise ValueError("Block merkle root does not match its transactions.")
+        return merkle_root
+
+    def hash_block(self, block, header=None):
+        # The header commits to the transactions only through the fixed-size merkle root; callers that
+        # already built the root from the transactions pass the encoded header to skip rebuilding it
+        if header is None:
+            self.checked_merkle_root(block)
+            header = encode_block_header(block)
+        return shake_digest(header, self.security_level).hex()
+
+    def mine_block(self, block, difficulty_bits=None, num_workers=None, header=None):
+        difficulty_bits = self.difficulty_bits if difficulty_bits is None else difficulty_bits
+        if not 0 <= difficulty_bits <= 8 * HASH_SIZE:
+            raise ValueError(f"Difficulty must be between 0 and {8 * HASH_SIZE} bits.")
+        num_workers = num_workers or self.mining_workers or os.cpu_count() or 1
+        if header is None:
+            self.checked_merkle_root(block)
+            header = encode_block_header(block)
+        header_prefix = header[:-NONCE.size]
+        target = 1 << (8 * HASH_SIZE - difficulty_bits)
+
+        start = time.perf_counter()
+        if num_workers == 1:
+            results = queue.Queue()
+            search_nonces(header_prefix, self.security_level, target, 0, 1, threading.Event(), results)
+            worker_results = [results.get()]
+        else:
+            # Worker w tries nonces w, w + num_workers, ... so the nonce space is partitioned without coordination
+            stop_event = multiprocessing.Event()
+            results = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=search_nonces,
+                                                 args=(header_prefix, self.security_level, target, worker, num_workers, stop_event, results))
+                         for worker in range(num_workers)]
+            for process in processes:
+                process.start()
+            worker_results = []
+            try:
+                while len(worker_results) < len(processes):
+                    try:
+                        worker_results.append(results.get(timeout=1))
+                    except queue.Empty:
+                        if not any(process.is_alive() for process in processes):
+                            if any(result[0] is not None for result in worker_results):
+                                break
+                            raise RuntimeError("Mining workers exited without finding a nonce.")
+            finally:
+                stop_event.set()
+                for process in processes:
+                    if process.is_alive():
+                        process.terminate()
+                    process.join()
+        elapsed = time.perf_counter() - start
+
+        nonce, block_hash, _ = next(result for result in worker_results if result[0] is not None)
+        block['nonce'] = nonce
+        block['hash'] = block_hash
+        hashes = sum(result[2] for result in worker_results)
+        return {
+            'nonce': nonce,
+            'hashes': hashes,
+            'elapsed': elapsed,
+            'hash_rate': hashes / elapsed if elapsed > 0 else float('inf')
+        }
+
+    def remember_merkle_tree(self, block_hash, tree):
+        self.merkle_trees[block_hash_key(block_hash)] = tree
+        self.merkle_trees.move_to_end(block_hash_key(block_hash))
+        if len(self.merkle_trees) > self.merkle_cache_size:
+            self.merkle_trees.popitem(last=False)
+
+    def merkle_tree(self, block):
+        # Trees are kept per block, so a proof only walks the log n levels of an already built tree
+        key = block_hash_key(block['hash'])
+        tree = self.merkle_trees.get(key)
+        if tree is None:
+            tree = MerkleTree(self.security_level, block['transactions'])
+            self.remember_merkle_tree(key, tree)
         else:
-            return shake128(128, binascii.unhexlify(block_string))
+            self.merkle_trees.move_to_end(key)
+        return tree
+
+    def transaction_proof(self, block, transaction_index):
+        return self.merkle_tree(block).proof(transaction_index)
+
+    def verify_transaction_inclusion(self, block, transaction, proof):
+        return MerkleTree(self.security_level).verify_proof(transaction, proof, bytes.fromhex(block['merkle_root']))
+
+    def get_block_by_hash(self, block_hash):
+        if isinstance(self.blocks, MmapBlockStore):
+            return self.blocks.get_by_hash(block_hash)
+        key = block_hash_key(block_hash)
+        return next((block for block in self.blocks if block_hash_key(block['hash']) == key), None)
 
     def add_block(self, transactions):
         last_block = self.blocks[-1]
@@ -48,37 +687,165 @@ class PostQuantumBlockchain:
             'index': last_block['index'] + 1,
             'previous_hash': last_block['hash'],
             'transactions': transactions,
-            'nonce': 0  # Placeholder for nonce, real implementation would find a valid nonce
+            'nonce': 0
         }
-        new_block['hash'] = self.hash_block(new_block)
+        tree = MerkleTree(self.security_level, transactions)
+        new_block['merkle_root'] = tree.root().hex()
+        header = encode_block_header(new_block)
+        if self.difficulty_bits > 0:
+            self.mine_block(new_block, header=header)
+        else:
+            new_block['hash'] = self.hash_block(new_block, header=header)
         self.blocks.append(new_block)
+        self.remember_merkle_tree(new_block['hash'], tree)
 
-    def sign_transaction(self, transaction):
-        seed = self.generate_qrng_seed()
-        xmss = xmss_fast.XmssFast(seed, self.xmss_tree_height)
+    def create_signing_key(self, key_id):
+        if self.keystore is None:
+            raise ValueError("A keystore is required to create persistent signing keys.")
+        return self.keystore.generate_key(key_id, seed=self.generate_qrng_seed(384).to_bytes(48, 'big'))
+
+    def sign_transaction(self, transaction, key_id=None):
+        if key_id is not None:
+            if self.keystore is None:
+                raise ValueError("A keystore is required to sign with a persistent key.")
+            signature = self.keystore.sign(key_id, hashlib.sha256(transaction.encode()).digest())
+            return binascii.hexlify(signature).decode()
+        seed = self.generate_qrng_seed(384).to_bytes(48, 'big')
+        xmss = xmss_fast.XmssFast(tuple(seed), self.xmss_tree_height)
         signature = xmss.sign(hstr2bin(hashlib.sha256(transaction.encode()).hexdigest()))
         return binascii.hexlify(signature).decode()
 
     def verify_transaction(self, transaction, signature, public_key):
-        xmss = xmss_fast.XmssFast.from_extended_seed(hstr2bin(public_key))
-        return xmss.verify(hstr2bin(hashlib.sha256(transaction.encode()).hexdigest()), hstr2bin(signature))
+        return verify_signature(transaction, signature, public_key)
+
+    def verification_executor(self):
+        # Kept for the chain's lifetime so the workers and their parsed-key caches carry over between blocks
+        if self.verify_executor is None:
+            self.verify_executor = ProcessPoolExecutor(max_workers=self.verify_workers)
+        return self.verify_executor
+
+    def close(self):
+        if self.verify_executor is not None:
+            self.verify_executor.shutdown()
+            self.verify_executor = None
+        if self.owns_entropy_pool:
+            self.entropy_pool.close()
+            self.entropy_pool = None
+            self.owns_entropy_pool = False
+
+    def verify_batch(self, transactions, signatures, public_keys, chunk_size=256):
+        if not len(transactions) == len(signatures) == len(public_keys):
+            raise ValueError("Transactions, signatures and public keys must have the same length.")
+        items = list(zip(transactions, signatures, public_keys))
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+        start = time.perf_counter()
+        if self.verify_workers == 1 or len(chunks) <= 1:
+            chunk_results = [verify_chunk(chunk) for chunk in chunks]
+        else:
+            chunk_results = list(self.verification_executor().map(verify_chunk, chunks))
+        elapsed = time.perf_counter() - start
+
+        results = [result for chunk_result in chunk_results for result in chunk_result]
+        return {
+            'results': results,
+            'verified': sum(results),
+            'failed': len(results) - sum(results),
+            'elapsed': elapsed,
+            'throughput': len(results) / elapsed if elapsed > 0 else float('inf')
+        }
+
+def benchmark_signing_throughput(keystore, key_id, num_signatures=1000):
+    start = time.perf_counter()
+    xmss_fast.XmssFast(tuple(os.urandom(48)), keystore.tree_height)
+    keygen_time = time.perf_counter() - start
+
+    num_signatures = min(num_signatures, keystore.remaining_signatures(key_id))
+    start = time.perf_counter()
+    for i in range(num_signatures):
+        keystore.sign(key_id, hashlib.sha256(f"transaction {i}".encode()).digest())
+    elapsed = time.perf_counter() - start
+
+    print(f"Per-transaction key generation: {keygen_time:.4f} s per signature")
+    print(f"Keystore signing: {num_signatures} signatures in {elapsed:.3f} s "
+          f"({num_signatures / elapsed:.1f} signatures/s)")
+    return num_signatures / elapsed
+
+def benchmark_block_hashing(num_blocks=200, transactions_per_block=1000, security_level=256):
+    pq_blockchain = PostQuantumBlockchain(security_level=security_level)
+    blocks = [{
+        'index': index,
+        'previous_hash': '0' * 64,
+        'transactions': [f"Transaction {index}-{i}" for i in range(transactions_per_block)],
+        'nonce': 0
+    } for index in range(num_blocks)]
+
+    # The previous path hashed the repr of the full transaction list for every block
+    start = time.perf_counter()
+    for block in blocks:
+        shake_digest(f"{block['index']}{block['previous_hash']}{block['transactions']}{block['nonce']}".encode(), security_level)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for block in blocks:
+        block.pop('merkle_root', None)
+        pq_blockchain.hash_block(block)
+    merkle_time = time.perf_counter() - start
+
+    # Rehashing a header, e.g. for a new nonce, no longer touches the transactions
+    headers = [encode_block_header(block) for block in blocks]
+    start = time.perf_counter()
+    for block, header in zip(blocks, headers):
+        pq_blockchain.hash_block(block, header=header)
+    header_time = time.perf_counter() - start
+
+    print(f"Legacy string hashing: {num_blocks / legacy_time:.1f} blocks/s")
+    print(f"Merkle root + header hashing: {num_blocks / merkle_time:.1f} blocks/s")
+    print(f"Header rehashing with cached root: {num_blocks / header_time:.1f} blocks/s")
+    return legacy_time, merkle_time, header_time
+
+def benchmark_mining(difficulty_bits=20, num_workers=None):
+    hash_rates = {}
+    for security_level in (128, 256):
+        pq_blockchain = PostQuantumBlockchain(security_level=security_level)
+        pq_blockchain.create_genesis_block()
+        block = {
+            'index': 1,
+            'previous_hash': pq_blockchain.blocks[-1]['hash'],
+            'transactions': ["Alice sends 5 BTC to Bob"],
+            'nonce': 0
+        }
+        report = pq_blockchain.mine_block(block, difficulty_bits=difficulty_bits, num_workers=num_workers)
+        hash_rates[security_level] = report['hash_rate']
+        print(f"SHAKE{security_level}: nonce {report['nonce']} after {report['hashes']} hashes in "
+              f"{report['elapsed']:.3f} s ({report['hash_rate'] / 1e6:.3f} MH/s)")
+    return hash_rates
 
 def main():
-    pq_blockchain = PostQuantumBlockchain()
+    keystore = XmssKeystore(tempfile.mkdtemp(prefix='xmss_keystore_'))
+    pq_blockchain = PostQuantumBlockchain(keystore=keystore)
     pq_blockchain.generate_qrng_seed()
     pq_blockchain.create_genesis_block()
 
-    # Example transaction and signing
+    # Example transaction and signing with a persistent key
+    alice_public_key = pq_blockchain.create_signing_key('alice')
     transaction = "Alice sends 5 BTC to Bob"
-    signature = pq_blockchain.sign_transaction(transaction)
+    signature = pq_blockchain.sign_transaction(transaction, key_id='alice')
     print(f"Transaction Signature: {signature}")
 
-    # Assuming we have Alice's public key
-    alice_public_key = "YourPublicKeyHere"
     verification = pq_blockchain.verify_transaction(transaction, signature, alice_public_key)
     print(f"Transaction Verification: {verification}")
 
+    transactions = [f"Alice sends {amount} BTC to Bob" for amount in range(1, 101)]
+    signatures = [pq_blockchain.sign_transaction(batch_transaction, key_id='alice') for batch_transaction in transactions]
+    batch_report = pq_blockchain.verify_batch(transactions, signatures, [alice_public_key] * len(transactions))
+    print(f"Batch verification: {batch_report['verified']}/{len(transactions)} valid, "
+          f"{batch_report['throughput']:.1f} signatures/s")
+
     pq_blockchain.add_block([transaction])
 
+    benchmark_signing_throughput(keystore, 'alice', num_signatures=500)
+    pq_blockchain.close()
+
 if __name__ == "__main__":
     main()
@@ -1,19 +1,88 @@
 # src/scalable_integration/quantum_cloud_integration.py
 
+import asyncio
+import threading
+import time
 import numpy as np
-from qiskit import IBMQ, transpile, assemble
-from qiskit.providers.ibmq import least_busy
+from concurrent.futures import ThreadPoolExecutor
+from qiskit import IBMQ, Aer, transpile, assemble
 from qiskit.circuit import QuantumCircuit
 
+ACCOUNT_LOCK = threading.Lock()
+PROVIDER_CACHE = {}
+# transpile() fans a circuit list out to forked processes; concurrent forks from worker threads can deadlock
+TRANSPILE_LOCK = threading.Lock()
+
+def load_provider(api_token, provider_hub, provider_group, provider_project):
+    # Enables the account in memory once per process instead of rewriting saved credentials per instance
+    key = (provider_hub, provider_group, provider_project)
+    with ACCOUNT_LOCK:
+        if key not in PROVIDER_CACHE:
+            if IBMQ.active_account() is None:
+                IBMQ.enable_account(api_token)
+            PROVIDER_CACHE[key] = IBMQ.get_provider(hub=provider_hub, group=provider_group, project=provider_project)
+        return PROVIDER_CACHE[key]
+
+class BackendMetadataCache:
+    def __init__(self, ttl=300, status_ttl=30, clock=time.monotonic):
+        self.ttl = ttl
+        self.status_ttl = status_ttl  # Queue lengths change faster than configuration or calibration data
+        self.clock = clock
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def cached(self, key, loader, ttl):
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+        value = loader()
+        with self.lock:
+            self.entries[key] = (now, value)
+        return value
+
+    def backends(self, provider):
+        return self.cached(('backends', id(provider)), provider.backends, self.ttl)
+
+    def configuration(self, backend):
+        return self.cached((backend.name(), 'configuration'), backend.configuration, self.ttl)
+
+    def properties(self, backend):
+        return self.cached((backend.name(), 'properties'), backend.properties, self.ttl)
+
+    def status(self, backend):
+        return self.cached((backend.name(), 'status'), backend.status, self.status_ttl)
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+
 class QuantumCloudIntegration:
-    def __init__(self, api_token, provider_hub, provider_group, provider_project):
-        IBMQ.save_account(api_token, overwrite=True)
-        self.provider = IBMQ.load_account().get_provider(hub=provider_hub, group=provider_group, project=provider_project)
+    def __init__(self, api_token, provider_hub, provider_group, provider_project, provider=None, metadata_cache=None):
+        if provider is None:
+            provider = load_provider(api_token, provider_hub, provider_group, provider_project)
+        self.provider = provider
+        self.metadata_cache = metadata_cache or BackendMetadataCache()
         self.backend = None
 
+    @classmethod
+    def from_backend(cls, backend):
+        # Skips account loading, e.g. for a local Aer or fake backend
+        integration = cls.__new__(cls)
+        integration.provider = None
+        integration.metadata_cache = BackendMetadataCache()
+        integration.backend = backend
+        return integration
+
     def select_least_busy_backend(self, min_qubits):
-        large_enough_devices = self.provider.backends(filters=lambda x: x.configuration().n_qubits >= min_qubits and not x.configuration().simulator)
-        self.backend = least_busy(large_enough_devices)
+        large_enough_devices = [backend for backend in self.metadata_cache.backends(self.provider)
+                                if self.metadata_cache.configuration(backend).n_qubits >= min_qubits
+                                and not self.metadata_cache.configuration(backend).simulator]
+        operational_devices = [backend for backend in large_enough_devices if self.metadata_cache.status(backend).operational]
+        if not operational_devices:
+            raise ValueError(f"No operational backend with at least {min_qubits} qubits is available.")
+        self.backend = min(operational_devices, key=lambda backend: self.metadata_cache.status(backend).pending_jobs)
         print(f"Least busy backend: {self.backend}")
 
     def execute_quantum_circuit(self, circuit: QuantumCircuit, shots=1024):
@@ -25,6 +94,54 @@ class QuantumCloudIntegration:
         counts = result.get_counts(circuit)
         return counts
 
+    def max_experiments(self):
+        return getattr(self.metadata_cache.configuration(self.backend), 'max_experiments', None)
+
+    def run_batch(self, circuits, shots):
+        with TRANSPILE_LOCK:
+            transpiled_circuits = transpile(circuits, self.backend)
+        qobj = assemble(transpiled_circuits, shots=shots)
+        job = self.backend.run(qobj)
+        print(f"Executing job {job.job_id()} with {len(circuits)} circuits on backend {self.backend.name()}")
+        result = job.result()
+        return [result.get_counts(index) for index in range(len(circuits))]
+
+    async def submit_circuits(self, circuits, shots=1024, max_in_flight=4):
+        # Packs circuits into jobs of up to max_experiments and yields (circuit index, counts) as jobs finish
+        circuits = list(circuits)
+        batch_size = self.max_experiments() or len(circuits) or 1
+        batches = [list(range(start, min(start + batch_size, len(circuits)))) for start in range(0, len(circuits), batch_size)]
+        loop = asyncio.get_running_loop()
+        # The pool size is the in-flight cap; queued batches wait in the executor
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+        async def run_batch(indices):
+            batch_counts = await loop.run_in_executor(executor, self.run_batch, [circuits[index] for index in indices], shots)
+            return indices, batch_counts
+
+        tasks = [asyncio.ensure_future(run_batch(indices)) for indices in batches]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                indices, batch_counts = await completed
+                for index, counts in zip(indices, batch_counts):
+                    yield index, counts
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Never wait here: a consumer that stops early must not block the event loop on running cloud jobs
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def execute_quantum_circuits(self, circuits, shots=1024, max_in_flight=4):
+        circuits = list(circuits)
+
+        async def collect():
+            all_counts = [None] * len(circuits)
+            async for index, counts in self.submit_circuits(circuits, shots=shots, max_in_flight=max_in_flight):
+                all_counts[index] = counts
+            return all_counts
+
+        return asyncio.run(collect())
+
 def create_simple_circuit():
     qc = QuantumCircuit(2)
     qc.h(0)
@@ -45,5 +162,11 @@ def main():
     execution_result = quantum_integration.execute_quantum_circuit(simple_circuit)
     print(f"Execution Result: {execution_result}")
 
+def offline_example():
+    quantum_integration = QuantumCloudIntegration.from_backend(Aer.get_backend('qasm_simulator'))
+    circuits = [create_simple_circuit() for _ in range(100)]
+    all_counts = quantum_integration.execute_quantum_circuits(circuits, shots=1024)
+    print(f"Executed {len(all_counts)} circuits, first result: {all_counts[0]}")
+
 if __name__ == "__main__":
     main()
@@ -8,11 +8,16 @@ from qiskit.aqua.algorithms import QAOA
 from qiskit.optimization import QuadraticProgram
 from qiskit.optimization.algorithms import MinimumEigenOptimizer
 from qiskit.optimization.converters import QuadraticProgramToQubo
+from numpy_statevector_simulator import NumpyStatevectorSimulator
 
 class QuantumCognitiveModel:
-    def __init__(self, n_variables, p=1):
+    def __init__(self, n_variables, p=1, backend='aer'):
+        if backend not in ('aer', 'numpy'):
+            raise ValueError("Unsupported backend.")
         self.n_variables = n_variables
         self.p = p
+        self.backend = backend
+        self.numpy_simulator = NumpyStatevectorSimulator() if backend == 'numpy' else None
         self.circuit = QuantumCircuit(n_variables)
 
     def build_circuit(self, weights, bias):
@@ -33,6 +38,8 @@ class QuantumCognitiveModel:
             self.circuit.rx(2 * b * params[-2], i)
 
     def simulate(self):
+        if self.backend == 'numpy':
+            return self.numpy_simulator.get_statevector(self.circuit)
         simulator = Aer.get_backend('statevector_simulator')
         result = execute(self.circuit, simulator).result()
         statevector = result.get_statevector()
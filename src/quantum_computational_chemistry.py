@@ -1,25 +1,96 @@
 # src/utility_frameworks/quantum_computational_chemistry.py
 
-from qiskit_nature.drivers import PySCFDriver, UnitsType
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import time
+import numpy as np
+from qiskit_nature.drivers import BaseDriver, PySCFDriver, QMolecule, UnitsType
 from qiskit_nature.problems.second_quantization.electronic import ElectronicStructureProblem
 from qiskit_nature.converters.second_quantization.qubit_converter import QubitConverter
 from qiskit_nature.mappers.second_quantization import JordanWignerMapper, ParityMapper
-from qiskit_nature.algorithms import GroundStateEigensolver
 from qiskit.algorithms import NumPyMinimumEigensolver, VQE
 from qiskit.algorithms.optimizers import SLSQP
 from qiskit.circuit.library import TwoLocal
+from qiskit.opflow import PauliSumOp
+from qiskit.quantum_info import SparsePauliOp
 from qiskit import Aer
 
-def compute_ground_state(molecule_str, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner'):
+def normalize_geometry(molecule_str):
+    # Same separators PySCF accepts: atoms on ';' or newlines, coordinates on whitespace or ','
+    atoms = []
+    for atom in molecule_str.replace(';', '\n').replace(',', ' ').replace('\t', ' ').splitlines():
+        if not atom.strip():
+            continue
+        symbol, *coordinates = atom.split()
+        try:
+            values = [float(coordinate) + 0.0 for coordinate in coordinates]
+        except ValueError:
+            values = []
+        if len(values) != 3:
+            # Z-matrices and other layouts are keyed on the raw string, a miss is safer than a wrong hit
+            return molecule_str.strip()
+        atoms.append(f"{symbol.capitalize()} " + ' '.join(f"{value:.8f}" for value in values))
+    return '; '.join(atoms)
+
+def cache_key(*fields):
+    return hashlib.sha256(json.dumps(fields).encode('utf-8')).hexdigest()
+
+class CachedDriver(BaseDriver):
+    # Runs the wrapped driver once and keeps the resulting QMolecule as HDF5
+    def __init__(self, driver, molecule_file):
+        super().__init__()
+        self.driver = driver
+        self.molecule_file = molecule_file
+
+    def run(self):
+        if os.path.exists(self.molecule_file):
+            molecule = QMolecule(self.molecule_file)
+            molecule.load()
+            return molecule
+        molecule = self.driver.run()
+        temporary_file = f"{self.molecule_file}.{os.getpid()}.tmp"
+        molecule.save(temporary_file)
+        os.replace(temporary_file, self.molecule_file)
+        return molecule
+
+def save_qubit_operators(operators_file, main_op, aux_ops):
+    arrays = {}
+    for name, operator in [('main', main_op)] + [(f"aux_{index}", aux_op) for index, aux_op in enumerate(aux_ops)]:
+        labels, coeffs = zip(*operator.primitive.to_list())
+        arrays[f"{name}_labels"] = np.array(labels)
+        arrays[f"{name}_coeffs"] = np.array(coeffs, dtype=complex) * operator.coeff
+    arrays['num_aux'] = np.array(len(aux_ops))
+    temporary_file = f"{operators_file}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(temporary_file, **arrays)
+    os.replace(temporary_file, operators_file)
+
+def load_qubit_operators(operators_file):
+    with np.load(operators_file) as arrays:
+        def operator(name):
+            return PauliSumOp(SparsePauliOp.from_list(list(zip(arrays[f"{name}_labels"].tolist(), arrays[f"{name}_coeffs"]))))
+        main_op = operator('main')
+        aux_ops = [operator(f"aux_{index}") for index in range(int(arrays['num_aux']))]
+    return main_op, aux_ops
+
+def solve_ground_state(molecule_str, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner', charge=0, spin=0, cache_dir=None,
+                       initial_point=None):
     # Initialize a PySCF driver
-    driver = PySCFDriver(atom=molecule_str, unit=UnitsType.ANGSTROM, charge=0, spin=0, basis=basis)
+    driver = PySCFDriver(atom=molecule_str, unit=UnitsType.ANGSTROM, charge=charge, spin=spin, basis=basis)
+
+    # Integrals depend on the molecule only, mapped operators also on the mapper
+    operators_file = None
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        molecule_key = cache_key(normalize_geometry(molecule_str), basis.lower(), charge, spin)
+        driver = CachedDriver(driver, os.path.join(cache_dir, f"{molecule_key}.hdf5"))
+        operators_file = os.path.join(cache_dir, f"{cache_key(molecule_key, mapper_type)}.npz")
 
     # Set up the electronic structure problem
     problem = ElectronicStructureProblem(driver)
 
-    # Generate second-quantized operators
-    second_q_ops = problem.second_q_ops()
-
     # Choose the qubit mapping
     if mapper_type == 'JordanWigner':
         mapper = JordanWignerMapper()
@@ -32,14 +103,26 @@ def compute_ground_state(molecule_str, basis='sto3g', optimization_algo='VQE', m
     converter = QubitConverter(mapper=mapper)
 
     # Map the second-quantized operators to the qubits
-    main_op = converter.convert(second_q_ops[0])
+    if operators_file is not None and os.path.exists(operators_file):
+        main_op, aux_ops = load_qubit_operators(operators_file)
+        # interpret() only needs the molecule data, so the second-quantized operators are never built
+        problem._molecule_data = driver.run()
+        problem._molecule_data_transformed = problem._transform(problem._molecule_data)
+    else:
+        # Generate second-quantized operators
+        second_q_ops = problem.second_q_ops()
+        main_op = converter.convert(second_q_ops[0])
+        aux_ops = converter.convert_match(second_q_ops[1:])
+        if operators_file is not None:
+            save_qubit_operators(operators_file, main_op, aux_ops)
 
     if optimization_algo == 'VQE':
         # Use Variational Quantum Eigensolver
         optimizer = SLSQP(maxiter=1000)
         var_form = TwoLocal(rotation_blocks='ry', entanglement_blocks='cz',
                             entanglement='full', reps=3, parameter_prefix='y')
-        algorithm = VQE(ansatz=var_form, optimizer=optimizer, quantum_instance=Aer.get_backend('statevector_simulator'))
+        algorithm = VQE(ansatz=var_form, optimizer=optimizer, initial_point=initial_point,
+                        quantum_instance=Aer.get_backend('statevector_simulator'))
     elif optimization_algo == 'NumPyMinimumEigensolver':
         # Use classical NumPy eigensolver for benchmarking
         algorithm = NumPyMinimumEigensolver()
@@ -47,18 +130,88 @@ def compute_ground_state(molecule_str, basis='sto3g', optimization_algo='VQE', m
         raise ValueError("Unsupported optimization algorithm.")
 
     # Solve the problem and get the result
-    solver = GroundStateEigensolver(converter, algorithm)
-    result = solver.solve(problem)
+    raw_result = algorithm.compute_minimum_eigenvalue(main_op, aux_ops)
+    result = problem.interpret(raw_result)
+
+    return result, raw_result
 
+def compute_ground_state(molecule_str, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner', charge=0, spin=0, cache_dir=None):
+    result, _ = solve_ground_state(molecule_str, basis=basis, optimization_algo=optimization_algo, mapper_type=mapper_type,
+                                   charge=charge, spin=spin, cache_dir=cache_dir)
     return result
 
+def scan_segment(worker_id, segment, options, warm_start, results):
+    # Points in a segment are neighbours, so each VQE starts from the previous optimum
+    initial_point = None
+    for index, molecule_str in segment:
+        start = time.perf_counter()
+        row = {'index': index, 'geometry': molecule_str, 'worker': worker_id, 'warm_started': initial_point is not None}
+        try:
+            result, raw_result = solve_ground_state(molecule_str, initial_point=initial_point, **options)
+            optimal_point = getattr(raw_result, 'optimal_point', None)
+            row['energy'] = float(np.real(result.total_energies[0]))
+            row['optimal_point'] = None if optimal_point is None else np.asarray(optimal_point).tolist()
+            initial_point = row['optimal_point'] if warm_start else None
+        except Exception as error:
+            row['error'] = repr(error)
+            initial_point = None
+        row['seconds'] = time.perf_counter() - start
+        results.put(row)
+    results.put(None)
+
+def scan_geometries(geometries, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner', charge=0, spin=0, cache_dir=None,
+                    num_workers=None, warm_start=True):
+    # Yields one row per geometry as soon as it finishes; rows carry their index in the input order
+    geometries = list(geometries)
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(geometries)))
+    options = {'basis': basis, 'optimization_algo': optimization_algo, 'mapper_type': mapper_type,
+               'charge': charge, 'spin': spin, 'cache_dir': cache_dir}
+    segments = [[(int(index), geometries[index]) for index in indices]
+                for indices in np.array_split(np.arange(len(geometries)), num_workers) if len(indices)]
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=scan_segment, args=(worker_id, segment, options, warm_start, results))
+                 for worker_id, segment in enumerate(segments)]
+    for process in processes:
+        process.start()
+
+    try:
+        finished = 0
+        while finished < len(processes):
+            try:
+                row = results.get(timeout=1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("Scan workers exited without reporting all geometries.")
+                continue
+            if row is None:
+                finished += 1
+            else:
+                yield row
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
 def main():
     # Define the molecule: H2 molecule
     molecule = 'H 0 0 0; H 0 0 0.735'
-    result = compute_ground_state(molecule_str=molecule, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner')
+    result = compute_ground_state(molecule_str=molecule, basis='sto3g', optimization_algo='VQE', mapper_type='JordanWigner',
+                                  cache_dir='chemistry_cache')
 
     print("Ground state energy:", result.total_energies[0])
     print("Computed electronic dipole moments:", result.computed_dipole_moments[0])
 
+    # Dissociation curve: rows stream in as each worker finishes a point
+    bond_lengths = np.linspace(0.5, 2.5, 21)
+    geometries = [f'H 0 0 0; H 0 0 {bond_length:.3f}' for bond_length in bond_lengths]
+    for row in scan_geometries(geometries, cache_dir='chemistry_cache', num_workers=4):
+        if 'error' in row:
+            print(f"{bond_lengths[row['index']]:6.3f} A  failed: {row['error']}")
+        else:
+            print(f"{bond_lengths[row['index']]:6.3f} A  E = {row['energy']:.6f} Ha  {row['seconds']:6.2f} s  "
+                  f"worker {row['worker']}{'  warm' if row['warm_started'] else ''}")
+
 if __name__ == "__main__":
     main()
@@ -1,13 +1,204 @@
 # src/utility_frameworks/quantum_development_kit.py
 
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import qiskit
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from qiskit import QuantumCircuit, transpile, Aer, IBMQ, execute
 from qiskit.compiler import assemble
 from qiskit.tools.monitor import job_monitor
 from qiskit.visualization import plot_histogram, plot_state_qsphere
+from qiskit.providers.aer import AerSimulator
 from qiskit.providers.aer.noise import NoiseModel
+from qiskit.test.mock import FakeMelbourne
+from circuit_fingerprints import circuit_fingerprint
+
+JOB_SLOTS_LOCK = threading.Lock()
+JOB_SLOTS = {}
+DEFAULT_CONCURRENT_JOBS = 4
+
+class JobSlots:
+    # Like a semaphore, but a later run_many can raise or lower the cap while jobs are in flight
+    def __init__(self, cap):
+        self.cap = cap
+        self.in_use = 0
+        self.condition = threading.Condition()
+
+    def resize(self, cap):
+        with self.condition:
+            self.cap = cap
+            self.condition.notify_all()
+
+    def __enter__(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.in_use < self.cap)
+            self.in_use += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.condition:
+            self.in_use -= 1
+            self.condition.notify_all()
+
+def job_slots(backend, max_concurrent_jobs=None):
+    # Shared by every run_many call so the cap holds per backend, not per call; the latest explicit cap wins
+    with JOB_SLOTS_LOCK:
+        key = backend.name()
+        if key not in JOB_SLOTS:
+            JOB_SLOTS[key] = JobSlots(max_concurrent_jobs or DEFAULT_CONCURRENT_JOBS)
+        elif max_concurrent_jobs is not None:
+            JOB_SLOTS[key].resize(max_concurrent_jobs)
+        return JOB_SLOTS[key]
+
+NOISE_MODELS_LOCK = threading.Lock()
+NOISE_MODELS = {}
+
+def noise_model_key(backend):
+    # A calibration snapshot is identified by the backend name and the time its properties were last updated
+    properties = backend.properties()
+    if properties is None:
+        raise ValueError("Noise models require a backend with calibration properties.")
+    return backend.name(), str(properties.last_update_date)
+
+def cached_noise_model(backend):
+    key = noise_model_key(backend)
+    with NOISE_MODELS_LOCK:
+        if key not in NOISE_MODELS:
+            NOISE_MODELS[key] = NoiseModel.from_backend(backend)
+        return NOISE_MODELS[key]
+
+def run_trajectory_batch(job):
+    circuit, noise_model, shots, seed = job
+    # One simulator thread per worker, the parallelism comes from the process pool
+    simulator = AerSimulator(method='statevector', noise_model=noise_model, max_parallel_threads=1)
+    result = simulator.run(assemble(circuit, shots=shots, seed_simulator=seed)).result()
+    return result.get_counts()
+
+def with_saved_statevector(circuit):
+    # Save the state right before the measurements, which would otherwise collapse it
+    saved_circuit = QuantumCircuit(*circuit.qregs, *circuit.cregs, name=circuit.name)
+    saved = False
+    for instruction, qargs, cargs in circuit.data:
+        if instruction.name == 'measure' and not saved:
+            saved_circuit.save_statevector()
+            saved = True
+        saved_circuit.append(instruction, qargs, cargs)
+    if not saved:
+        saved_circuit.save_statevector()
+    return saved_circuit
+
+def saved_statevector(result, experiment=0):
+    return result.data(experiment).get('statevector')
+
+def render_figure(job):
+    method, data, filename = job
+    matplotlib.use('Agg')
+    if method == 'histogram':
+        figure = plot_histogram(data)
+    else:
+        figure = plot_state_qsphere(data)
+    figure.savefig(filename)
+    plt.close(figure)
+    return filename
+
+class TranspileCache:
+    def __init__(self, cache_dir=None, max_entries=256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # run_many transpiles from several threads at once
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_key(self, circuit, backend, optimization_level):
+        configuration = backend.configuration()
+        key = (circuit_fingerprint(circuit), backend.name(), getattr(configuration, 'backend_version', ''), optimization_level,
+               qiskit.__version__)
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def load_from_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = os.path.join(self.cache_dir, f"{key}.pickle")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as handle:
+                return pickle.load(handle)
+        except Exception:
+            # An unreadable or incompatible entry is just a miss; the fresh result overwrites it
+            return None
+
+    def store_to_disk(self, key, compiled_circuit):
+        if self.cache_dir is None:
+            return
+        path = os.path.join(self.cache_dir, f"{key}.pickle")
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                pickle.dump(compiled_circuit, handle)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def remember(self, key, compiled_circuit):
+        self.entries[key] = compiled_circuit
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def transpile(self, circuit, backend, optimization_level=3):
+        key = self.cache_key(circuit, backend, optimization_level)
+        with self.lock:
+            compiled_circuit = self.entries.get(key)
+            if compiled_circuit is not None:
+                self.entries.move_to_end(key)
+                self.memory_hits += 1
+        if compiled_circuit is None:
+            # Disk reads and transpilation run outside the lock; concurrent misses on one key may both transpile
+            compiled_circuit = self.load_from_disk(key)
+            from_disk = compiled_circuit is not None
+            if not from_disk:
+                compiled_circuit = transpile(circuit, backend, optimization_level=optimization_level)
+                self.store_to_disk(key, compiled_circuit)
+            with self.lock:
+                if from_disk:
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                self.remember(key, compiled_circuit)
+        # Results are looked up by circuit name, which is not part of the fingerprint
+        compiled_circuit = compiled_circuit.copy()
+        compiled_circuit.name = circuit.name
+        return compiled_circuit
+
+    def stats(self):
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
 
 class QuantumDevelopmentKit:
-    def __init__(self, backend_name='aer_simulator', use_real_device=False, api_token=None, provider_hub=None, provider_group=None, provider_project=None):
+    def __init__(self, backend_name='aer_simulator', use_real_device=False, api_token=None, provider_hub=None, provider_group=None, provider_project=None,
+                 transpile_cache_dir=None):
+        self.transpile_cache = TranspileCache(cache_dir=transpile_cache_dir)
         if use_real_device:
             if not api_token:
                 raise ValueError("API token is required to use real quantum devices.")
@@ -22,28 +213,163 @@ class QuantumDevelopmentKit:
         circuit = QuantumCircuit(num_qubits)
         return circuit
 
-    def run_circuit(self, circuit, shots=1024, optimization_level=3):
-        transpiled_circuit = transpile(circuit, self.backend, optimization_level=optimization_level)
+    def run_circuit(self, circuit, shots=1024, optimization_level=3, monitor=True, save_statevector=False):
+        if save_statevector:
+            circuit = with_saved_statevector(circuit)
+        transpiled_circuit = self.transpile_cache.transpile(circuit, self.backend, optimization_level=optimization_level)
         qobj = assemble(transpiled_circuit, shots=shots)
         job = self.backend.run(qobj)
-        job_monitor(job)
+        if monitor:
+            job_monitor(job)
         return job.result()
 
-    def visualize_results(self, result, method='histogram'):
+    def run_batch(self, circuits, futures, shots, optimization_level, slots):
+        # Futures cancelled before the batch starts are dropped; the rest can no longer be cancelled
+        live = [(circuit, future) for circuit, future in zip(circuits, futures) if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            with slots:
+                transpiled_circuits = [self.transpile_cache.transpile(circuit, self.backend, optimization_level=optimization_level)
+                                       for circuit, _ in live]
+                job = self.backend.run(assemble(transpiled_circuits, shots=shots))
+                result = job.result()
+            for position, (_, future) in enumerate(live):
+                future.set_result(result.get_counts(position))
+        except Exception as error:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(error)
+
+    def run_many(self, circuits, shots=1024, optimization_level=3, max_concurrent_jobs=None, max_experiments=None):
+        # Returns one future per circuit resolving to its counts; compatible circuits share a job
+        circuits = list(circuits)
+        futures = [Future() for _ in circuits]
+        if not circuits:
+            return futures
+        max_experiments = max_experiments or getattr(self.backend.configuration(), 'max_experiments', None) or len(circuits)
+        slots = job_slots(self.backend, max_concurrent_jobs)
+        executor = ThreadPoolExecutor(max_workers=slots.cap)
+        for start in range(0, len(circuits), max_experiments):
+            executor.submit(self.run_batch, circuits[start:start + max_experiments], futures[start:start + max_experiments],
+                            shots, optimization_level, slots)
+        executor.shutdown(wait=False)
+        return futures
+
+    def visualize_results(self, result, method='histogram', filename=None):
+        figure = None
         if method == 'histogram':
-            plot_histogram(result.get_counts())
+            figure = plot_histogram(result.get_counts())
         elif method == 'qsphere':
-            statevector_backend = Aer.get_backend('statevector_simulator')
-            circuit = result.to_dict()['results'][0]['header']['compiled_circuit_qasm']
-            qc = QuantumCircuit.from_qasm_str(circuit)
-            statevector = execute(qc, statevector_backend).result().get_statevector()
-            plot_state_qsphere(statevector)
-
-    def get_noise_model(self):
-        if not isinstance(self.backend, Aer.get_backend('qasm_simulator').__class__):
-            raise ValueError("Noise models can only be retrieved for Aer qasm_simulator backend.")
-        noise_model = NoiseModel.from_backend(self.backend)
-        return noise_model
+            statevector = saved_statevector(result)
+            if statevector is None:
+                statevector_backend = Aer.get_backend('statevector_simulator')
+                circuit = result.to_dict()['results'][0]['header']['compiled_circuit_qasm']
+                qc = QuantumCircuit.from_qasm_str(circuit)
+                statevector = execute(qc, statevector_backend).result().get_statevector()
+            figure = plot_state_qsphere(statevector)
+        if figure is not None and filename is not None:
+            figure.savefig(filename)
+            plt.close(figure)
+        return figure
+
+    def render_results(self, results, output_dir, method='histogram', max_workers=None):
+        # Renders headlessly in worker processes from saved counts or statevectors, nothing is re-simulated
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = []
+        for index, result in enumerate(results):
+            if method == 'histogram':
+                data = result.get_counts()
+            elif method == 'qsphere':
+                data = saved_statevector(result)
+                if data is None:
+                    raise ValueError("Result has no saved statevector; run the circuit with save_statevector=True.")
+                data = np.asarray(data)
+            else:
+                raise ValueError("Unsupported visualization method.")
+            jobs.append((method, data, os.path.join(output_dir, f"{method}_{index}.png")))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(render_figure, jobs))
+
+    def get_noise_model(self, noise_backend=None):
+        return cached_noise_model(noise_backend or self.backend)
+
+    def trajectory_seeds(self, num_batches, seed=None):
+        return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(num_batches)]
+
+    def run_noisy(self, circuit, shots=1024, noise_backend=None, method='trajectory', num_workers=None, seed=None, optimization_level=1):
+        noise_backend = noise_backend or self.backend
+        noise_model = self.get_noise_model(noise_backend)
+        transpiled_circuit = self.transpile_cache.transpile(circuit, noise_backend, optimization_level=optimization_level)
+
+        if method == 'density_matrix':
+            simulator = AerSimulator(method='density_matrix', noise_model=noise_model)
+            result = simulator.run(assemble(transpiled_circuit, shots=shots, seed_simulator=seed)).result()
+            return result.get_counts()
+        if method != 'trajectory':
+            raise ValueError("Unsupported noisy simulation method.")
+
+        num_batches = min(num_workers or os.cpu_count() or 1, shots)
+        batch_shots = [shots // num_batches + (1 if batch < shots % num_batches else 0) for batch in range(num_batches)]
+        jobs = [(transpiled_circuit, noise_model, batch, batch_seed)
+                for batch, batch_seed in zip(batch_shots, self.trajectory_seeds(num_batches, seed))]
+        counts = Counter()
+        with ProcessPoolExecutor(max_workers=num_batches) as executor:
+            for batch_counts in executor.map(run_trajectory_batch, jobs):
+                counts.update(batch_counts)
+        return dict(counts)
+
+def benchmark_run_many(num_circuits=200, shots=1024, max_experiments=50):
+    qdk = QuantumDevelopmentKit()
+    circuits = []
+    for angle in np.linspace(0, np.pi, num_circuits):
+        circuit = qdk.create_quantum_circuit(2)
+        circuit.ry(angle, 0)
+        circuit.cx(0, 1)
+        circuit.measure_all()
+        circuits.append(circuit)
+
+    start = time.perf_counter()
+    for circuit in circuits:
+        qdk.run_circuit(circuit, shots=shots, monitor=False).get_counts()
+    sequential_time = time.perf_counter() - start
+
+    # A fresh kit so the sequential pass has not already warmed the transpile cache
+    qdk = QuantumDevelopmentKit()
+    start = time.perf_counter()
+    futures = qdk.run_many(circuits, shots=shots, max_experiments=max_experiments)
+    for future in futures:
+        future.result()
+    run_many_time = time.perf_counter() - start
+
+    print(f"run_circuit: {num_circuits / sequential_time:.1f} circuits/s")
+    print(f"run_many: {num_circuits / run_many_time:.1f} circuits/s")
+    return sequential_time, run_many_time
+
+def create_noisy_benchmark_circuit(num_qubits):
+    circuit = QuantumCircuit(num_qubits)
+    circuit.h(0)
+    for qubit in range(num_qubits - 1):
+        circuit.cx(qubit, qubit + 1)
+    circuit.measure_all()
+    return circuit
+
+def benchmark_noisy_simulation(qubit_counts=range(2, 11), shots=4096, num_workers=None, seed=1234):
+    qdk = QuantumDevelopmentKit()
+    noise_backend = FakeMelbourne()
+    timings = []
+    for num_qubits in qubit_counts:
+        circuit = create_noisy_benchmark_circuit(num_qubits)
+        start = time.perf_counter()
+        qdk.run_noisy(circuit, shots=shots, noise_backend=noise_backend, method='density_matrix', seed=seed)
+        density_matrix_time = time.perf_counter() - start
+        start = time.perf_counter()
+        qdk.run_noisy(circuit, shots=shots, noise_backend=noise_backend, method='trajectory', num_workers=num_workers, seed=seed)
+        trajectory_time = time.perf_counter() - start
+        winner = 'density_matrix' if density_matrix_time < trajectory_time else 'trajectory'
+        timings.append((num_qubits, density_matrix_time, trajectory_time, winner))
+        print(f"{num_qubits:>3} qubits: density matrix {density_matrix_time:8.3f} s, trajectory {trajectory_time:8.3f} s -> {winner}")
+    return timings
 
 def main():
     qdk = QuantumDevelopmentKit(use_real_device=False)
@@ -51,8 +377,9 @@ def main():
     qc.h(0)
     qc.cx(0, 1)
     qc.measure_all()
-    result = qdk.run_circuit(qc)
+    result = qdk.run_circuit(qc, save_statevector=True)
     qdk.visualize_results(result, method='histogram')
+    qdk.visualize_results(result, method='qsphere', filename='qsphere.png')
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,15 @@
 from qiskit import QuantumCircuit, execute, Aer
 from qiskit.visualization import plot_histogram
 import matplotlib.pyplot as plt
+from numpy_statevector_simulator import NumpyStatevectorSimulator
 
 class EntanglementDynamics:
-    def __init__(self, num_qubits):
+    def __init__(self, num_qubits, backend='aer'):
+        if backend not in ('aer', 'numpy'):
+            raise ValueError("Unsupported backend.")
         self.num_qubits = num_qubits
+        self.backend = backend
+        self.numpy_simulator = NumpyStatevectorSimulator() if backend == 'numpy' else None
         self.circuit = QuantumCircuit(num_qubits, num_qubits)
 
     def create_entanglement(self):
@@ -23,6 +28,8 @@ class EntanglementDynamics:
         self.circuit.measure(range(self.num_qubits), range(self.num_qubits))
 
     def simulate(self):
+        if self.backend == 'numpy':
+            return self.numpy_simulator.get_counts(self.circuit, shots=1024)
         backend = Aer.get_backend('qasm_simulator')
         job = execute(self.circuit, backend, shots=1024)
         result = job.result()
@@ -5,10 +5,15 @@ from qiskit import Aer, execute, QuantumCircuit, transpile
 from qiskit.circuit import Parameter
 from qiskit.visualization import plot_bloch_multivector
 import matplotlib.pyplot as plt
+from numpy_statevector_simulator import NumpyStatevectorSimulator
 
 class QuantumGravitationalEffects:
-    def __init__(self, num_qubits):
+    def __init__(self, num_qubits, backend='aer'):
+        if backend not in ('aer', 'numpy'):
+            raise ValueError("Unsupported backend.")
         self.num_qubits = num_qubits
+        self.backend = backend
+        self.numpy_simulator = NumpyStatevectorSimulator() if backend == 'numpy' else None
         self.theta = Parameter('θ')
 
     def create_quantum_circuit(self, gravitational_strength):
@@ -21,6 +26,8 @@ class QuantumGravitationalEffects:
         return circuit
 
     def simulate_gravity_effect(self, circuit):
+        if self.backend == 'numpy':
+            return self.numpy_simulator.get_statevector(circuit)
         simulator = Aer.get_backend('statevector_simulator')
         compiled_circuit = transpile(circuit, simulator)
         job = execute(compiled_circuit, simulator)
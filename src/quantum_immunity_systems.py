@@ -3,10 +3,15 @@
 from qiskit import QuantumCircuit, Aer, execute
 from qiskit.circuit import ParameterVector
 from qiskit.quantum_info import random_unitary
+from numpy_statevector_simulator import NumpyStatevectorSimulator
 
 class QuantumImmunitySystem:
-    def __init__(self, num_qubits):
+    def __init__(self, num_qubits, backend='aer'):
+        if backend not in ('aer', 'numpy'):
+            raise ValueError("Unsupported backend.")
         self.num_qubits = num_qubits
+        self.backend = backend
+        self.numpy_simulator = NumpyStatevectorSimulator() if backend == 'numpy' else None
         self.parameters = ParameterVector('theta', length=num_qubits * 3)
         self.circuit = QuantumCircuit(num_qubits)
 
@@ -34,9 +39,11 @@ class QuantumImmunitySystem:
         return attack_circuit
 
     def evaluate_immunity(self, attack_strength):
-        backend = Aer.get_backend('statevector_simulator')
         attack_circuit = self.simulate_attack(attack_strength)
         full_circuit = self.circuit.compose(attack_circuit)
+        if self.backend == 'numpy':
+            return self.numpy_simulator.get_statevector(full_circuit)
+        backend = Aer.get_backend('statevector_simulator')
         job = execute(full_circuit, backend)
         result = job.result()
         final_state = result.get_statevector()
@@ -6,17 +6,50 @@ from qiskit.aqua.algorithms import NumPyMinimumEigensolver
 from qiskit.optimization import QuadraticProgram
 from qiskit.optimization.algorithms import MinimumEigenOptimizer
 from deap import base, creator, tools, algorithms
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
 import random
+import traceback
+import zlib
 import numpy as np
 
 class QuantumNeuroevolution:
-    def __init__(self, num_qubits, num_generations=100, population_size=50):
+    def __init__(self, num_qubits, num_generations=100, population_size=50, parallel=None, num_workers=None, seed=None,
+                 use_cache=True, cache_size=4096, cache_decimals=10, fitness_mode='shots', shots=1024):
+        if parallel not in (None, 'thread', 'process'):
+            raise ValueError("Unsupported parallel mode.")
+        if fitness_mode not in ('shots', 'exact'):
+            raise ValueError("Unsupported fitness mode.")
         self.num_qubits = num_qubits
         self.num_generations = num_generations
         self.population_size = population_size
+        self.parallel = parallel
+        self.num_workers = num_workers
+        self.seed = seed
+        self.use_cache = use_cache
+        self.cache_size = cache_size
+        self.cache_decimals = cache_decimals
+        self.fitness_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fitness_mode = fitness_mode
+        self.shots = shots
         self.parameters = ParameterVector('theta', length=num_qubits)
         self.backend = Aer.get_backend('qasm_simulator')
 
+    def __getstate__(self):
+        # Backends are not picklable; worker processes fetch their own and never need the parent's cache
+        state = self.__dict__.copy()
+        state['backend'] = None
+        state['fitness_cache'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.backend = Aer.get_backend('qasm_simulator')
+
     def quantum_neural_network(self, params):
         circuit = QuantumCircuit(self.num_qubits, self.num_qubits)
         for i, param in enumerate(self.parameters):
@@ -24,15 +57,30 @@ class QuantumNeuroevolution:
         for i in range(self.num_qubits - 1):
             circuit.cx(i, i + 1)
         circuit.measure(range(self.num_qubits), range(self.num_qubits))
-        return circuit
+        return circuit.bind_parameters(dict(zip(self.parameters, params)))
+
+    def simulator_seed(self, individual):
+        # Derived from the genome rather than evaluation order, so results do not depend on worker scheduling
+        genome = np.asarray(individual, dtype=float).tobytes()
+        return (self.seed + zlib.crc32(genome)) % (2 ** 31)
 
     def evaluate_individual(self, individual):
+        if self.fitness_mode == 'exact':
+            return self.evaluate_population([individual])[0]
         circuit = self.quantum_neural_network(individual)
-        job = execute(circuit, self.backend, shots=1024)
+        seed_simulator = self.simulator_seed(individual) if self.seed is not None else None
+        job = execute(circuit, self.backend, shots=self.shots, seed_simulator=seed_simulator)
         result = job.result().get_counts(circuit)
         fitness = result.get('0' * self.num_qubits, 0)
         return (fitness,)
 
+    def evaluate_population(self, individuals):
+        genomes = np.asarray([list(individual) for individual in individuals], dtype=float).reshape(-1, self.num_qubits)
+        # The CNOT ladder only permutes basis states and maps |0...0> to itself, so the all-zeros
+        # probability is that of the RX layer alone: the product of cos^2(theta_i / 2)
+        probabilities = np.prod(np.cos(genomes / 2) ** 2, axis=1)
+        return [(float(fitness),) for fitness in self.shots * probabilities]
+
     def setup_evolution(self):
         creator.create("FitnessMax", base.Fitness, weights=(1.0,))
         creator.create("Individual", list, fitness=creator.FitnessMax)
@@ -48,25 +96,181 @@ class QuantumNeuroevolution:
 
         return toolbox
 
-    def run_evolution(self):
-        toolbox = self.setup_evolution()
-        population = toolbox.population(n=self.population_size)
+    def create_executor(self):
+        if self.parallel == 'thread':
+            return ThreadPoolExecutor(max_workers=self.num_workers)
+        if self.parallel == 'process':
+            return ProcessPoolExecutor(max_workers=self.num_workers)
+        return None
 
+    def parallel_map(self, executor, function, individuals):
+        if executor is None:
+            return list(map(function, individuals))
+        # Plain lists avoid pickling the DEAP creator classes into worker processes
+        individuals = [list(individual) for individual in individuals]
+        num_workers = self.num_workers or os.cpu_count() or 1
+        chunksize = max(1, len(individuals) // (4 * num_workers))
+        return list(executor.map(function, individuals, chunksize=chunksize))
+
+    def cache_key(self, individual):
+        return tuple(np.round(np.asarray(individual, dtype=float), self.cache_decimals).tolist())
+
+    def cached_map(self, executor, function, individuals):
+        individuals = list(individuals)
+        if not self.use_cache:
+            return self.parallel_map(executor, function, individuals)
+
+        keys = [self.cache_key(individual) for individual in individuals]
+        fitnesses = {}
+        pending = {}
+        for key, individual in zip(keys, individuals):
+            if key in fitnesses or key in pending:
+                self.cache_hits += 1
+            elif key in self.fitness_cache:
+                self.fitness_cache.move_to_end(key)
+                fitnesses[key] = self.fitness_cache[key]
+                self.cache_hits += 1
+            else:
+                pending[key] = individual
+                self.cache_misses += 1
+
+        for key, fitness in zip(pending, self.parallel_map(executor, function, list(pending.values()))):
+            fitnesses[key] = fitness
+            self.fitness_cache[key] = fitness
+            if len(self.fitness_cache) > self.cache_size:
+                self.fitness_cache.popitem(last=False)
+        return [fitnesses[key] for key in keys]
+
+    def population_map(self, executor, function, individuals):
+        if self.fitness_mode == 'exact':
+            return self.evaluate_population(individuals)
+        return self.cached_map(executor, function, individuals)
+
+    def create_statistics(self):
         stats = tools.Statistics(key=lambda ind: ind.fitness.values)
         stats.register("avg", np.mean)
         stats.register("std", np.std)
         stats.register("min", np.min)
         stats.register("max", np.max)
+        if self.use_cache and self.fitness_mode == 'shots':
+            stats.register("cache_hits", lambda _: self.cache_hits)
+            stats.register("cache_misses", lambda _: self.cache_misses)
+        return stats
+
+    def run_evolution(self):
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+        toolbox = self.setup_evolution()
+        executor = self.create_executor() if self.fitness_mode == 'shots' else None
+        toolbox.register("map", self.population_map, executor)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        population = toolbox.population(n=self.population_size)
+        stats = self.create_statistics()
+
+        try:
+            final_population, logbook = algorithms.eaSimple(population, toolbox, cxpb=0.5, mutpb=0.2, ngen=self.num_generations, stats=stats, verbose=True)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return final_population, logbook
+
+    def evaluate_invalid(self, toolbox, population):
+        invalid_individuals = [individual for individual in population if not individual.fitness.valid]
+        for individual, fitness in zip(invalid_individuals, toolbox.map(toolbox.evaluate, invalid_individuals)):
+            individual.fitness.values = fitness
+        return len(invalid_individuals)
+
+    def migrate(self, population, migration_size, inbox, outbox):
+        emigrants = tools.selBest(population, migration_size)
+        outbox.put([(list(individual), individual.fitness.values) for individual in emigrants])
+        immigrants = inbox.get()
+        for individual, (genome, fitness) in zip(tools.selWorst(population, len(immigrants)), immigrants):
+            individual[:] = genome
+            individual.fitness.values = fitness
+
+    def evolve_island(self, island_id, num_islands, migration_interval, migration_size, inbox, outbox):
+        if self.seed is not None:
+            random.seed(self.seed + island_id)
+            np.random.seed(self.seed + island_id)
+        toolbox = self.setup_evolution()
+        toolbox.register("map", self.population_map, None)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        stats = self.create_statistics()
+        logbook = tools.Logbook()
 
-        final_population, logbook = algorithms.eaSimple(population, toolbox, cxpb=0.5, mutpb=0.2, ngen=self.num_generations, stats=stats, verbose=True)
+        population = toolbox.population(n=self.population_size)
+        nevals = self.evaluate_invalid(toolbox, population)
+        logbook.record(gen=0, island=island_id, nevals=nevals, **stats.compile(population))
+
+        for gen in range(1, self.num_generations + 1):
+            offspring = toolbox.select(population, len(population))
+            offspring = algorithms.varAnd(offspring, toolbox, cxpb=0.5, mutpb=0.2)
+            nevals = self.evaluate_invalid(toolbox, offspring)
+            population[:] = offspring
+            if num_islands > 1 and gen % migration_interval == 0:
+                self.migrate(population, migration_size, inbox, outbox)
+            logbook.record(gen=gen, island=island_id, nevals=nevals, **stats.compile(population))
+
+        return population, logbook
+
+    def run_island_evolution(self, num_islands=None, migration_interval=5, migration_size=2):
+        num_islands = num_islands or os.cpu_count() or 1
+        # Ring topology: island i receives on queue i and sends its migrants to island i + 1
+        migration_queues = [multiprocessing.Queue() for _ in range(num_islands)]
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=island_worker,
+                                             args=(self, island_id, num_islands, migration_interval, migration_size,
+                                                   migration_queues[island_id], migration_queues[(island_id + 1) % num_islands], results))
+                     for island_id in range(num_islands)]
+        for process in processes:
+            process.start()
+
+        island_results = []
+        try:
+            for _ in processes:
+                island_id, population, records = results.get()
+                if population is None:
+                    raise RuntimeError(f"Island {island_id} failed:\n{records}")
+                island_results.append((island_id, population, records))
+        finally:
+            for process in processes:
+                if process.is_alive() and len(island_results) < num_islands:
+                    process.terminate()
+                process.join()
+
+        self.setup_evolution()
+        final_population = []
+        merged_records = []
+        for island_id, population, records in sorted(island_results, key=lambda island_result: island_result[0]):
+            for genome, fitness in population:
+                individual = creator.Individual(genome)
+                individual.fitness.values = fitness
+                final_population.append(individual)
+            merged_records.extend(records)
+
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'island', 'nevals'] + self.create_statistics().fields
+        for record in sorted(merged_records, key=lambda record: (record['gen'], record['island'])):
+            logbook.record(**record)
         return final_population, logbook
 
+def island_worker(evolution, island_id, num_islands, migration_interval, migration_size, inbox, outbox, results):
+    try:
+        population, logbook = evolution.evolve_island(island_id, num_islands, migration_interval, migration_size, inbox, outbox)
+    except Exception:
+        results.put((island_id, None, traceback.format_exc()))
+        return
+    results.put((island_id, [(list(individual), individual.fitness.values) for individual in population], list(logbook)))
+
 def main():
     num_qubits = 4
     num_generations = 50
     population_size = 20
 
-    quantum_neuroevolution = QuantumNeuroevolution(num_qubits, num_generations, population_size)
+    quantum_neuroevolution = QuantumNeuroevolution(num_qubits, num_generations, population_size, parallel='process', seed=42)
     final_population, logbook = quantum_neuroevolution.run_evolution()
 
     best_individual = tools.selBest(final_population, 1)[0]
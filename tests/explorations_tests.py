@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+from qiskit.quantum_info import Statevector
+
+def test_agent_closed_form_matches_statevector():
+    agents = pytest.importorskip("autonomous_quantum_agents")
+    for n_qubits in (1, 3, 4):
+        agent = agents.QuantumAgent(n_qubits, mode='exact')
+        thetas = np.linspace(-np.pi, np.pi, 11)
+
+        expected = [agent.exact_probability(theta) for theta in thetas]
+
+        assert np.allclose(agent.exact_probabilities(thetas), expected)
+
+def test_agent_exact_objective_is_deterministic():
+    agents = pytest.importorskip("autonomous_quantum_agents")
+    agent = agents.QuantumAgent(2, mode='exact')
+
+    assert agent.objective_function([0.7]) == agent.objective_function([0.7])
+    assert agent.objective_function([0.7]) == pytest.approx(np.sin(3 * 0.7 / 2) ** 2)
+
+def test_agent_rejects_unknown_mode():
+    agents = pytest.importorskip("autonomous_quantum_agents")
+    with pytest.raises(ValueError):
+        agents.QuantumAgent(2, mode='sampled')
+
+def test_neuroevolution_exact_fitness_matches_statevector():
+    neuroevolution = pytest.importorskip("quantum_neuroevolution")
+    evolution = neuroevolution.QuantumNeuroevolution(3, fitness_mode='exact', shots=1000)
+    genomes = np.random.default_rng(3).uniform(-np.pi, np.pi, size=(6, 3))
+
+    fitness = evolution.evaluate_population(genomes)
+
+    for genome, (value,) in zip(genomes, fitness):
+        circuit = evolution.quantum_neural_network(genome)
+        circuit.remove_final_measurements()
+        expected = 1000 * Statevector.from_instruction(circuit).probabilities()[0]
+        assert value == pytest.approx(expected)
+
+def test_neuroevolution_exact_individual_matches_population():
+    neuroevolution = pytest.importorskip("quantum_neuroevolution")
+    evolution = neuroevolution.QuantumNeuroevolution(4, fitness_mode='exact', shots=500)
+    individual = [0.1, -1.2, 2.5, 0.0]
+
+    assert evolution.evaluate_individual(individual) == evolution.evaluate_population([individual])[0]
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qiskit")
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+
+def test_numpy_statevector_matches_qiskit():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    circuit = simulator_module.create_benchmark_circuit(5, 3, seed=7)
+    circuit.swap(0, 3)
+    circuit.ccx(0, 2, 4)
+    circuit.cp(0.3, 1, 4)
+    circuit.h(2)
+
+    expected = Statevector.from_instruction(circuit).data
+    actual = simulator_module.NumpyStatevectorSimulator().get_statevector(circuit)
+
+    assert np.allclose(actual, expected)
+
+def test_numpy_statevector_ignores_terminal_measurements():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.ry(0.4, 2)
+    expected = Statevector.from_instruction(circuit).data
+    circuit.measure_all()
+
+    actual = simulator_module.NumpyStatevectorSimulator().get_statevector(circuit)
+
+    assert np.allclose(actual, expected)
+
+def test_numpy_counts_follow_clbit_mapping():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    circuit = QuantumCircuit(2, 2)
+    circuit.x(0)
+    circuit.measure(0, 1)
+    circuit.measure(1, 0)
+
+    counts = simulator_module.NumpyStatevectorSimulator(seed=1).get_counts(circuit, shots=100)
+
+    assert counts == {'10': 100}
+
+def test_numpy_counts_are_seeded():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.h(1)
+    circuit.measure_all()
+
+    first = simulator_module.NumpyStatevectorSimulator(seed=5).get_counts(circuit, shots=2000)
+    second = simulator_module.NumpyStatevectorSimulator(seed=5).get_counts(circuit, shots=2000)
+
+    assert first == second
+    assert sum(first.values()) == 2000
+    assert set(first) == {'00', '01', '10', '11'}
+
+def test_numpy_matrix_cache_keeps_same_named_gates_apart():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    from qiskit.circuit import Gate
+    from qiskit.circuit.library import QFT
+    first = QuantumCircuit(2)
+    first.h(0)
+    second = QuantumCircuit(2)
+    second.x(1)
+    circuit = QuantumCircuit(5)
+    circuit.h([0, 1, 2, 3])
+    circuit.mcx([0, 1, 2], 4)
+    circuit.mcx([0, 1, 2, 3], 4)
+    circuit.append(QFT(2), [0, 1])
+    circuit.append(QFT(3), [2, 3, 4])
+    for definition in (first, second):
+        gate = Gate('g', 2, [])
+        gate.definition = definition
+        circuit.append(gate, [1, 3])
+
+    expected = Statevector.from_instruction(circuit).data
+    actual = simulator_module.NumpyStatevectorSimulator().get_statevector(circuit)
+
+    assert np.allclose(actual, expected)
+
+def test_numpy_statevector_rejects_mid_circuit_measurement():
+    simulator_module = pytest.importorskip("numpy_statevector_simulator")
+    circuit = QuantumCircuit(1, 1)
+    circuit.measure(0, 0)
+    circuit.x(0)
+
+    with pytest.raises(ValueError):
+        simulator_module.NumpyStatevectorSimulator().get_statevector(circuit)
+
+def thewalrus_statistics(num_modes, r, theta, phi, hbar):
+    from thewalrus.quantum import photon_number_covmat, photon_number_mean_vector
+    from thewalrus.symplectic import beam_splitter, expand, squeezing
+    symplectic = np.identity(2 * num_modes)
+    for mode in range(num_modes):
+        symplectic = expand(squeezing(r), mode, num_modes) @ symplectic
+    for mode in range(num_modes - 1):
+        symplectic = expand(beam_splitter(theta, phi), [mode, mode + 1], num_modes) @ symplectic
+    covariance = symplectic @ (hbar / 2 * np.identity(2 * num_modes)) @ symplectic.T
+    means = np.zeros(2 * num_modes)
+    return covariance, photon_number_mean_vector(means, covariance, hbar=hbar), photon_number_covmat(means, covariance, hbar=hbar)
+
+def test_sweep_statistics_match_thewalrus():
+    photonic = pytest.importorskip("photonic_quantum_systems")
+    pytest.importorskip("thewalrus")
+    system = photonic.PhotonicQuantumSystem(3, 1.0)
+    squeezing_values = [0.0, 0.2, 0.6]
+    thetas = [0.3, np.pi / 4]
+    phis = [0.0, 1.1]
+
+    sweep = system.sweep_statistics(squeezing_values, thetas=thetas, phis=phis)
+
+    assert sweep['mean_photon'].shape == (3, 2, 2, 3)
+    assert sweep['cov_photon'].shape == (3, 2, 2, 3, 3)
+    for i, r in enumerate(squeezing_values):
+        for j, theta in enumerate(thetas):
+            for k, phi in enumerate(phis):
+                covariance, mean_photon, cov_photon = thewalrus_statistics(3, r, theta, phi, photonic.sf.hbar)
+                assert np.allclose(sweep['covariances'][i, j, k], covariance)
+                assert np.allclose(sweep['mean_photon'][i, j, k], mean_photon)
+                assert np.allclose(sweep['cov_photon'][i, j, k], cov_photon)
+
+def test_sweep_statistics_default_matches_engine():
+    photonic = pytest.importorskip("photonic_quantum_systems")
+    system = photonic.PhotonicQuantumSystem(4, 0.5)
+    system.setup_system()
+    state = system.run_simulation()
+
+    sweep = system.sweep_statistics([np.sqrt(0.5)])
+
+    assert np.allclose(sweep['covariances'][0, 0, 0], state.cov())
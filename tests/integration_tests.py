@@ -0,0 +1,217 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import Future
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("qiskit")
+from qiskit import Aer, QuantumCircuit
+
+cloud = pytest.importorskip("quantum_cloud_integration")
+
+def basis_state_circuit(value, num_qubits=4):
+    circuit = QuantumCircuit(num_qubits)
+    for qubit in range(num_qubits):
+        if (value >> qubit) & 1:
+            circuit.x(qubit)
+    circuit.measure_all()
+    return circuit
+
+def test_execute_quantum_circuits_preserves_order(monkeypatch):
+    integration = cloud.QuantumCloudIntegration.from_backend(Aer.get_backend('qasm_simulator'))
+    monkeypatch.setattr(integration, 'max_experiments', lambda: 3)
+    circuits = [basis_state_circuit(value) for value in range(16)]
+
+    all_counts = integration.execute_quantum_circuits(circuits, shots=64, max_in_flight=4)
+
+    assert all_counts == [{format(value, '04b'): 64} for value in range(16)]
+
+def test_submit_circuits_early_exit_does_not_wait_for_running_jobs(monkeypatch):
+    integration = cloud.QuantumCloudIntegration.from_backend(Aer.get_backend('qasm_simulator'))
+    monkeypatch.setattr(integration, 'max_experiments', lambda: 1)
+
+    def run_batch(circuits, shots):
+        if circuits[0] == 'slow':
+            time.sleep(2)
+        return [{'0': shots}]
+
+    monkeypatch.setattr(integration, 'run_batch', run_batch)
+
+    async def first_result():
+        async for index, counts in integration.submit_circuits(['fast', 'slow'], shots=8, max_in_flight=2):
+            return index, counts
+
+    start = time.perf_counter()
+    assert asyncio.run(first_result()) == (0, {'0': 8})
+    assert time.perf_counter() - start < 1
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class StubBackend:
+    def __init__(self, name, n_qubits, pending_jobs, simulator=False, operational=True):
+        self.backend_name = name
+        self.n_qubits = n_qubits
+        self.pending_jobs = pending_jobs
+        self.simulator = simulator
+        self.operational = operational
+        self.calls = Counter()
+
+    def name(self):
+        return self.backend_name
+
+    def configuration(self):
+        self.calls['configuration'] += 1
+        return SimpleNamespace(n_qubits=self.n_qubits, simulator=self.simulator)
+
+    def properties(self):
+        self.calls['properties'] += 1
+        return SimpleNamespace(last_update_date=self.calls['properties'])
+
+    def status(self):
+        self.calls['status'] += 1
+        return SimpleNamespace(operational=self.operational, pending_jobs=self.pending_jobs)
+
+class StubProvider:
+    def __init__(self, backends):
+        self.available = backends
+        self.calls = 0
+
+    def backends(self):
+        self.calls += 1
+        return list(self.available)
+
+def test_metadata_cache_expires_after_ttl():
+    clock = FakeClock()
+    cache = cloud.BackendMetadataCache(ttl=300, status_ttl=30, clock=clock)
+    backend = StubBackend('ibmq_stub', 5, pending_jobs=3)
+
+    cache.configuration(backend)
+    cache.status(backend)
+    clock.now = 29.9
+    cache.configuration(backend)
+    cache.status(backend)
+    assert backend.calls == Counter(configuration=1, status=1)
+
+    clock.now = 30
+    cache.status(backend)
+    cache.configuration(backend)
+    assert backend.calls == Counter(configuration=1, status=2)
+
+    clock.now = 300
+    cache.configuration(backend)
+    assert backend.calls['configuration'] == 2
+
+    cache.invalidate()
+    cache.properties(backend)
+    cache.properties(backend)
+    assert backend.calls['properties'] == 1
+
+def test_select_least_busy_backend_with_stubbed_provider():
+    clock = FakeClock()
+    busy = StubBackend('ibmq_busy', 7, pending_jobs=12)
+    quiet = StubBackend('ibmq_quiet', 5, pending_jobs=2)
+    small = StubBackend('ibmq_small', 1, pending_jobs=0)
+    simulator = StubBackend('ibmq_qasm_simulator', 32, pending_jobs=0, simulator=True)
+    offline = StubBackend('ibmq_offline', 27, pending_jobs=0, operational=False)
+    provider = StubProvider([busy, quiet, small, simulator, offline])
+    integration = cloud.QuantumCloudIntegration(None, None, None, None, provider=provider,
+                                                metadata_cache=cloud.BackendMetadataCache(clock=clock))
+
+    integration.select_least_busy_backend(min_qubits=5)
+    assert integration.backend is quiet
+
+    quiet.pending_jobs = 50
+    integration.select_least_busy_backend(min_qubits=5)
+    assert integration.backend is quiet
+    assert provider.calls == 1
+    assert quiet.calls['status'] == 1
+
+    clock.now = 30
+    integration.select_least_busy_backend(min_qubits=5)
+    assert integration.backend is busy
+    assert provider.calls == 1
+
+    with pytest.raises(ValueError):
+        integration.select_least_busy_backend(min_qubits=100)
+
+def test_circuit_fingerprint_distinguishes_conditions_and_phase():
+    fingerprints = pytest.importorskip("circuit_fingerprints")
+    from qiskit import ClassicalRegister, QuantumRegister
+
+    def conditioned(value=None, phase=0.0):
+        qreg, creg = QuantumRegister(1, 'q'), ClassicalRegister(2, 'c')
+        circuit = QuantumCircuit(qreg, creg, global_phase=phase)
+        if value is None:
+            circuit.x(0)
+        else:
+            circuit.x(0).c_if(creg, value)
+        return circuit
+
+    keys = [fingerprints.circuit_fingerprint(circuit)
+            for circuit in (conditioned(), conditioned(1), conditioned(2), conditioned(phase=0.5))]
+
+    assert len(set(keys)) == len(keys)
+    assert fingerprints.circuit_fingerprint(conditioned(1)) == fingerprints.circuit_fingerprint(conditioned(1))
+
+def test_circuit_fingerprint_distinguishes_composite_gates_with_one_name():
+    fingerprints = pytest.importorskip("circuit_fingerprints")
+    first, second = QuantumCircuit(2), QuantumCircuit(2)
+    first.h(0)
+    second.x(1)
+    circuits = []
+    for definition in (first, second):
+        gate = definition.to_gate()
+        gate.name = 'g'
+        circuit = QuantumCircuit(2)
+        circuit.append(gate, [0, 1])
+        circuits.append(circuit)
+
+    assert fingerprints.circuit_fingerprint(circuits[0]) != fingerprints.circuit_fingerprint(circuits[1])
+
+def test_transpile_cache_treats_unloadable_entries_as_misses(tmp_path):
+    kit_module = pytest.importorskip("quantum_development_kit")
+    cache = kit_module.TranspileCache(cache_dir=str(tmp_path))
+    backend = Aer.get_backend('qasm_simulator')
+    circuit = basis_state_circuit(5)
+    key = cache.cache_key(circuit, backend, 1)
+    # A pickle that refers to a class missing from this qiskit version raises on load
+    (tmp_path / f"{key}.pickle").write_bytes(b"cmissing_module\nMissingClass\n.")
+
+    compiled = cache.transpile(circuit, backend, optimization_level=1)
+
+    assert compiled.name == circuit.name
+    assert cache.stats()['misses'] == 1
+    reopened = kit_module.TranspileCache(cache_dir=str(tmp_path))
+    reopened.transpile(circuit, backend, optimization_level=1)
+    assert reopened.stats()['disk_hits'] == 1
+
+def test_run_batch_skips_cancelled_futures(tmp_path):
+    kit_module = pytest.importorskip("quantum_development_kit")
+    kit = kit_module.QuantumDevelopmentKit(transpile_cache_dir=str(tmp_path))
+    futures = [Future() for _ in range(3)]
+    futures[1].cancel()
+
+    kit.run_batch([basis_state_circuit(value) for value in range(3)], futures, 32, 1, kit_module.job_slots(kit.backend))
+
+    assert futures[0].result() == {'0000': 32}
+    assert futures[1].cancelled()
+    assert futures[2].result() == {'0010': 32}
+
+def test_later_run_many_call_resizes_the_backend_job_cap(tmp_path):
+    kit_module = pytest.importorskip("quantum_development_kit")
+    kit = kit_module.QuantumDevelopmentKit(transpile_cache_dir=str(tmp_path))
+    circuits = [basis_state_circuit(value) for value in range(4)]
+
+    first = kit.run_many(circuits, shots=16, optimization_level=1, max_concurrent_jobs=2, max_experiments=1)
+    second = kit.run_many(circuits, shots=16, optimization_level=1, max_concurrent_jobs=3, max_experiments=1)
+
+    expected = [{format(value, '04b'): 16} for value in range(4)]
+    assert [future.result() for future in first] == expected
+    assert [future.result() for future in second] == expected
+    assert kit_module.job_slots(kit.backend).cap == 3
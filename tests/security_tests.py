@@ -0,0 +1,260 @@
+import threading
+import pytest
+
+blockchain = pytest.importorskip("post_quantum_blockchain")
+
+def make_block(index):
+    return {
+        'index': index,
+        'previous_hash': blockchain.shake_digest(str(index - 1).encode()).hex(),
+        'merkle_root': blockchain.MerkleTree(transactions=[f"tx {index}"]).root().hex(),
+        'transactions': [f"tx {index}"],
+        'nonce': index * 7,
+        'hash': blockchain.shake_digest(str(index).encode()).hex()
+    }
+
+def test_block_store_survives_reopen(tmp_path):
+    path = str(tmp_path / 'chain')
+    store = blockchain.MmapBlockStore(path)
+    for index in range(3000):
+        store.append(make_block(index))
+    store.close()
+
+    store = blockchain.MmapBlockStore(path)
+    try:
+        assert len(store) == 3000
+        assert store[0] == make_block(0)
+        assert store[-1] == make_block(2999)
+        assert [block['index'] for block in store][:5] == [0, 1, 2, 3, 4]
+        for index in range(0, 3000, 97):
+            assert store.get_by_hash(make_block(index)['hash']) == make_block(index)
+        assert store.get_by_hash(blockchain.shake_digest(b'missing').hex()) is None
+    finally:
+        store.close()
+
+def test_block_store_recovers_from_torn_tail(tmp_path):
+    path = str(tmp_path / 'chain')
+    store = blockchain.MmapBlockStore(path)
+    for index in range(10):
+        store.append(make_block(index))
+    store.close()
+    with open(f"{path}.blocks", 'ab') as handle:
+        handle.write(b'PQBK half-written record')
+    with open(f"{path}.offsets", 'ab') as handle:
+        handle.write(b'\x01\x02\x03')
+
+    store = blockchain.MmapBlockStore(path)
+    assert len(store) == 10
+    assert store[-1] == make_block(9)
+    store.append(make_block(10))
+    store.close()
+
+    store = blockchain.MmapBlockStore(path)
+    try:
+        assert len(store) == 11
+        assert store.get_by_hash(make_block(10)['hash']) == make_block(10)
+        store.append(make_block(11))
+    finally:
+        store.close()
+
+    # A crash after the hash entry but before the offset entry leaves an orphaned hash pointing at index 11
+    with open(f"{path}.offsets", 'r+b') as handle:
+        handle.truncate(11 * blockchain.MmapBlockStore.OFFSET_ENTRY.size)
+    replacement = dict(make_block(11), hash=blockchain.shake_digest(b'replacement').hex())
+    store = blockchain.MmapBlockStore(path)
+    try:
+        assert len(store) == 11
+        store.append(replacement)
+        assert store.get_by_hash(make_block(11)['hash']) is None
+        assert store.get_by_hash(replacement['hash']) == replacement
+    finally:
+        store.close()
+
+def test_block_store_rebuilds_damaged_hash_index(tmp_path):
+    path = str(tmp_path / 'chain')
+    store = blockchain.MmapBlockStore(path)
+    for index in range(50):
+        store.append(make_block(index))
+    store.close()
+    with open(f"{path}.hashes", 'r+b') as handle:
+        handle.truncate(10)
+
+    store = blockchain.MmapBlockStore(path)
+    try:
+        assert len(store) == 50
+        assert all(store.get_by_hash(make_block(index)['hash'])['index'] == index for index in range(50))
+    finally:
+        store.close()
+
+def reference_root(tree, transactions):
+    level = [tree.leaf_hash(transaction) for transaction in transactions]
+    while len(level) > 1:
+        level = [tree.node_hash(level[index], level[index + 1]) if index + 1 < len(level) else level[index]
+                 for index in range(0, len(level), 2)]
+    return level[0]
+
+def test_merkle_root_matches_reference():
+    for count in (1, 2, 3, 5, 8, 13, 100):
+        transactions = [f"Alice sends {amount} BTC to Bob" for amount in range(count)]
+        tree = blockchain.MerkleTree(transactions=transactions)
+        assert tree.root() == reference_root(tree, transactions)
+    assert blockchain.MerkleTree().root() == bytes(blockchain.HASH_SIZE)
+
+def test_merkle_proofs_verify_and_reject_tampering():
+    transactions = [f"tx {index}" for index in range(13)]
+    tree = blockchain.MerkleTree(transactions=transactions)
+    root = tree.root()
+
+    for index, transaction in enumerate(transactions):
+        proof = tree.proof(index)
+        assert len(proof) <= 4
+        assert tree.verify_proof(transaction, proof, root)
+        assert not tree.verify_proof(transaction + ' tampered', proof, root)
+        if proof:
+            sibling, sibling_is_left = proof[0]
+            assert not tree.verify_proof(transaction, [(bytes(len(sibling)), sibling_is_left)] + proof[1:], root)
+    assert not tree.verify_proof(transactions[0], tree.proof(0), blockchain.shake_digest(b'other root'))
+    with pytest.raises(IndexError):
+        tree.proof(len(transactions))
+
+def test_leaf_cannot_pose_as_inner_node():
+    tree = blockchain.MerkleTree(transactions=['a', 'b', 'c', 'd'])
+    inner_node = tree.node_hash(tree.leaf_hash('c'), tree.leaf_hash('d'))
+    assert tree.node_hash(tree.proof(2)[1][0], inner_node) == tree.root()
+
+    assert not tree.verify_proof(inner_node.hex(), tree.proof(2)[1:], tree.root())
+
+def test_chain_transaction_proofs():
+    chain = blockchain.PostQuantumBlockchain(merkle_cache_size=2)
+    chain.create_genesis_block()
+    for block_number in range(4):
+        chain.add_block([f"block {block_number} tx {index}" for index in range(9)])
+
+    for block in list(chain.blocks)[1:]:
+        for index, transaction in enumerate(block['transactions']):
+            proof = chain.transaction_proof(block, index)
+            assert chain.verify_transaction_inclusion(block, transaction, proof)
+            assert not chain.verify_transaction_inclusion(block, transaction + '!', proof)
+    assert len(chain.merkle_trees) == 2
+
+def test_only_text_transactions_are_accepted(tmp_path):
+    with pytest.raises(TypeError):
+        blockchain.MerkleTree(transactions=[b'raw bytes'])
+    block = dict(make_block(1), transactions=["caf\u00e9 \u2192 \u4e2d"])
+    store = blockchain.MmapBlockStore(str(tmp_path / 'chain'))
+    try:
+        store.append(block)
+        with pytest.raises(TypeError):
+            store.append(dict(make_block(2), transactions=[b'raw bytes']))
+        assert len(store) == 1
+        assert store[0]['transactions'] == block['transactions']
+    finally:
+        store.close()
+
+def test_hash_block_rejects_tampered_transactions():
+    chain = blockchain.PostQuantumBlockchain()
+    chain.create_genesis_block()
+    chain.add_block(["Alice sends 5 BTC to Bob", "Bob sends 2 BTC to Carol"])
+    block = chain.blocks[-1]
+    assert chain.hash_block(dict(block)) == block['hash']
+
+    tampered = dict(block, transactions=["Alice sends 500 BTC to Bob", "Bob sends 2 BTC to Carol"])
+    with pytest.raises(ValueError):
+        chain.hash_block(tampered)
+    tampered.pop('merkle_root')
+    assert chain.hash_block(tampered) != block['hash']
+
+def test_mined_blocks_meet_the_difficulty_target():
+    for num_workers in (1, 2):
+        chain = blockchain.PostQuantumBlockchain(difficulty_bits=8, mining_workers=num_workers)
+        chain.create_genesis_block()
+        chain.add_block([f"worker count {num_workers}"])
+        block = chain.blocks[-1]
+        assert chain.hash_block(dict(block)) == block['hash']
+        assert int(block['hash'], 16) < 1 << (8 * blockchain.HASH_SIZE - 8)
+    for difficulty_bits in (-1, 8 * blockchain.HASH_SIZE + 1):
+        with pytest.raises(ValueError):
+            chain.mine_block(dict(block), difficulty_bits=difficulty_bits)
+
+class CountingEntropyPool(blockchain.QrngEntropyPool):
+    # Deterministic batches stand in for simulator shots so the refill order can be checked
+    def sample_bytes(self):
+        self.batches = getattr(self, 'batches', 0) + 1
+        return bytes([self.batches]) * 4
+
+class FailingEntropyPool(blockchain.QrngEntropyPool):
+    def sample_bytes(self):
+        raise OSError("backend unavailable")
+
+def test_entropy_pool_refills_in_order_and_serves_large_reads():
+    pool = CountingEntropyPool(capacity=8, low_watermark=4)
+    try:
+        assert pool.read(6) == bytes([1, 1, 1, 1, 2, 2])
+        assert pool.read(20) == bytes([2, 2]) + b''.join(bytes([batch]) * 4 for batch in range(3, 7)) + bytes([7, 7])
+        assert pool.read(2) == bytes([7, 7])
+    finally:
+        pool.close()
+    assert not pool.refill_thread.is_alive()
+    with pytest.raises(ValueError):
+        pool.read(len(pool.buffer) + 1)
+
+def test_entropy_pool_surfaces_refill_errors():
+    pool = FailingEntropyPool()
+    try:
+        with pytest.raises(RuntimeError) as error:
+            pool.read(1)
+        assert isinstance(error.value.__cause__, OSError)
+    finally:
+        pool.close()
+
+def test_chain_closes_only_the_entropy_pool_it_created(monkeypatch):
+    monkeypatch.setattr(blockchain, 'QrngEntropyPool', CountingEntropyPool)
+    chain = blockchain.PostQuantumBlockchain()
+    chain.generate_qrng_seed()
+    pool = chain.entropy_pool
+    chain.close()
+    assert pool.closed and not pool.refill_thread.is_alive()
+    assert chain.entropy_pool is None
+
+    shared = CountingEntropyPool()
+    try:
+        chain = blockchain.PostQuantumBlockchain(entropy_pool=shared)
+        chain.generate_qrng_seed()
+        chain.close()
+        assert not shared.closed
+    finally:
+        shared.close()
+
+def test_keystores_sharing_a_directory_never_reuse_ots_indices(tmp_path):
+    first = blockchain.XmssKeystore(str(tmp_path), tree_height=4, reserve_batch=3)
+    public_key = first.generate_key('alice', seed=bytes(range(48)))
+    second = blockchain.XmssKeystore(str(tmp_path), tree_height=4, reserve_batch=3)
+    message = b'same message every time'
+
+    signatures = [(first if index % 2 else second).sign('alice', message) for index in range(12)]
+    # A repeated one-time index would reproduce an identical signature for the same message
+    signatures.append(blockchain.XmssKeystore(str(tmp_path), tree_height=4).sign('alice', message))
+
+    assert len(set(signatures)) == len(signatures)
+    assert second.public_key('alice') == public_key
+
+def test_keystore_concurrent_first_use_keeps_one_key_object(tmp_path):
+    blockchain.XmssKeystore(str(tmp_path), tree_height=4).generate_key('bob', seed=bytes(48))
+    keystore = blockchain.XmssKeystore(str(tmp_path), tree_height=4, reserve_batch=2)
+    message = b'payload'
+    signatures = []
+
+    def sign():
+        signatures.append(keystore.sign('bob', message))
+
+    def inspect():
+        keystore.public_key('bob')
+        keystore.remaining_signatures('bob')
+
+    threads = [threading.Thread(target=sign if index % 2 else inspect) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(signatures)) == len(signatures) == 4